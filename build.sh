@@ -29,6 +29,11 @@ poetry run -C build \
 
 cd build/lib/python3.*/site-packages
 touch podaac/__init__.py
+
+# Precompile report templates so lambdas skip Jinja parsing on cold starts;
+# loaded by podaac.sigevent.rendering.create_jinja_env
+"$ROOT_PATH/build/bin/python" -m podaac.sigevent.rendering \
+  podaac/sigevent/resources/compiled
 rm -rf *.dist-info _virtualenv.*
 find . -type d -name __pycache__ -exec rm -rf {} \+
 
@@ -0,0 +1,228 @@
+"""
+Client library for emitting Sigevent messages.
+
+Events are validated against EventMessage, buffered in a bounded queue and
+published from a background thread through SNS PublishBatch, sending up to
+ten events per API call instead of one. Throttled or otherwise transient
+publish failures are retried a bounded number of times before the events
+are counted as failed. Example:
+
+    client = SigeventClient(topic_arn)
+    client.emit(
+        collection_name='MODIS_A-JPL-L2P-v2019.0',
+        category='ingest',
+        subject='Granule ingested',
+        description='...',
+        event_level='INFO',
+        source_name='ingest-pipeline',
+        executor='ingest-lambda'
+    )
+    client.close()
+"""
+import atexit
+from datetime import datetime, timezone
+import logging
+import queue
+import threading
+import time
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+from podaac.sigevent.errors import is_transient
+from podaac.sigevent.message import EventMessage
+
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+MAX_PUBLISH_ATTEMPTS = 3
+PUBLISH_RETRY_DELAY = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+# Queue marker stopping the background thread; flush requests are queued
+# as threading.Events set once the buffered events were published
+_STOP = object()
+
+
+class SigeventClient:  # pylint: disable=too-many-instance-attributes
+    """
+    A buffering Sigevent emitter publishing to the Sigevent input topic.
+
+    Parameters
+    ----------
+    topic_arn: str
+        ARN of the Sigevent input SNS topic
+    sns_client: object
+        boto3 SNS client; a default client is created when not provided
+    max_queue_size: int
+        Maximum number of events buffered before emit applies backpressure
+    flush_interval: float
+        Maximum number of seconds an event is buffered before publishing
+    """
+
+    def __init__(self, topic_arn: str, sns_client=None,
+                 max_queue_size: int = 10000, flush_interval: float = 1.0):
+        self.topic_arn = topic_arn
+        self.sns = sns_client if sns_client is not None \
+            else boto3.client('sns')
+        self.flush_interval = flush_interval
+        self.publish_calls = 0
+        self.failed_count = 0
+
+        self._queue = queue.Queue(max_queue_size)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name='sigevent-client', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, message: EventMessage | dict = None, block: bool = True,
+             timeout: float = None, **fields):
+        """
+        Validates and buffers an event for publishing. The event can be
+        given as an EventMessage, a dict or as keyword fields. When the
+        buffer is full, emit blocks until space frees up or raises
+        queue.Full if block is False or the timeout expires.
+        """
+        if self._closed:
+            raise RuntimeError('SigeventClient is closed')
+
+        if message is None:
+            message = EventMessage(**fields)
+        elif not isinstance(message, EventMessage):
+            message = EventMessage.model_validate(message)
+
+        # Stamp events at emit time since publishing is deferred
+        if message.timestamp is None:
+            message = message.model_copy(update={
+                'timestamp': datetime.now(timezone.utc)
+            })
+
+        body = message.model_dump_json()
+        if len(body.encode('utf-8')) > MAX_BATCH_BYTES:
+            raise ValueError('Event exceeds the 256 KB SNS message limit')
+
+        self._queue.put(body, block=block, timeout=timeout)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Publishes all events emitted so far; returns False if they were not
+        published before the timeout expired
+        """
+        if self._closed:
+            return True
+
+        flushed = threading.Event()
+        self._queue.put(flushed)
+        return flushed.wait(timeout)
+
+    def close(self, timeout: float = None):
+        """
+        Publishes all buffered events and stops the background thread
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _run(self):
+        batch = []
+        batch_bytes = 0
+        deadline = None
+
+        while True:
+            wait = None if deadline is None \
+                else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                self._publish(batch)
+                batch, batch_bytes, deadline = [], 0, None
+                continue
+
+            if item is _STOP or isinstance(item, threading.Event):
+                self._publish(batch)
+                batch, batch_bytes, deadline = [], 0, None
+                if item is _STOP:
+                    return
+                item.set()
+                continue
+
+            size = len(item.encode('utf-8'))
+            if batch_bytes + size > MAX_BATCH_BYTES:
+                self._publish(batch)
+                batch, batch_bytes, deadline = [], 0, None
+
+            batch.append(item)
+            batch_bytes += size
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+
+            if len(batch) == MAX_BATCH_ENTRIES:
+                self._publish(batch)
+                batch, batch_bytes, deadline = [], 0, None
+
+    def _publish(self, batch: list[str]):
+        if not batch:
+            return
+
+        # Never let a failure stop the background thread, otherwise pending
+        # flushes would wait forever
+        try:
+            self._publish_batch(batch)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.failed_count += len(batch)
+            logger.exception('Failed to publish %d events', len(batch))
+
+    def _publish_batch(self, batch: list[str]):
+        pending = dict(enumerate(batch))
+
+        for attempt in range(1, MAX_PUBLISH_ATTEMPTS + 1):
+            if attempt > 1:
+                time.sleep(PUBLISH_RETRY_DELAY * 2 ** (attempt - 2))
+
+            self.publish_calls += 1
+            try:
+                response = self.sns.publish_batch(
+                    TopicArn=self.topic_arn,
+                    PublishBatchRequestEntries=[
+                        {'Id': str(index), 'Message': body}
+                        for index, body in pending.items()
+                    ]
+                )
+            except (BotoCoreError, ClientError) as ex:
+                if attempt < MAX_PUBLISH_ATTEMPTS and is_transient(ex):
+                    logger.warning(
+                        'Retrying %d events after error: %s', len(pending), ex
+                    )
+                    continue
+
+                self.failed_count += len(pending)
+                logger.error(
+                    'Failed to publish %d events: %s', len(pending), ex
+                )
+                return
+
+            retry = {}
+            for failure in response.get('Failed', []):
+                index = int(failure['Id'])
+                if not failure.get('SenderFault') \
+                        and attempt < MAX_PUBLISH_ATTEMPTS:
+                    retry[index] = pending[index]
+                    continue
+
+                self.failed_count += 1
+                logger.error('Failed to publish event: %s', pending[index])
+
+            if not retry:
+                return
+            pending = retry
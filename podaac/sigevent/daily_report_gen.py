@@ -3,25 +3,39 @@ lambda_daily_handler.py is a thin wrapper around the daily report
 sigevent handler logic and is the entrypoint for AWS Lambda.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import csv
 from datetime import date, datetime, timezone
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from tempfile import NamedTemporaryFile, TemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryFile, gettempdir
 import logging
 import json
+import os
+import time
+from typing import Iterable, Iterator
 
 import boto3
-import jinja2
+from botocore.exceptions import BotoCoreError, ClientError
 
-from podaac.sigevent.message import EventMessage, EventLevel
+from podaac.sigevent.message import (
+    EventMessage, EventLevel, RollupMessage, parse_event_message
+)
+from podaac.sigevent.profiling import profiled
+from podaac.sigevent.rendering import create_jinja_env
 from podaac.sigevent.utilities import utils
 
 MAX_TABLE_SIZE = 10
 CLOUDWATCH_LOG_GROUP = utils.get_param('log_group')
 NOTIFICATION_EMAILS = json.loads(utils.get_param('notification_emails'))
 STAGE = utils.get_param('stage')
+REPORT_SOURCES = utils.get_param('report_sources')
+REPORT_WORKERS = int(utils.get_param('report_workers') or 4)
+# Seconds reserved at the end of an invocation for rendering and sending
+REPORT_TIME_MARGIN = 15
+REPORT_BUCKET = utils.get_param('report_bucket')
+REPORT_CACHE_DIR = os.path.join(gettempdir(), 'sigevent-reports')
 
 SES_REGION = utils.get_param('ses_region')
 SES_SENDER_ARN = utils.get_param('ses_sender_arn')
@@ -29,29 +43,56 @@ SES_CONFIG_SET_NAME = utils.get_param('ses_config_set_name')
 
 ses = boto3.client('sesv2', region_name=SES_REGION)
 cloudwatchlogs = boto3.client('logs')
-jinja_env = jinja2.Environment(
-    loader=jinja2.PackageLoader(__package__, 'resources'))
+s3 = boto3.client('s3')
+jinja_env = create_jinja_env()
 logger = utils.get_logger(__name__)
 
 
-def invoke(event, _):
+@profiled
+def invoke(event, context):
     """
-    AWS Lambda entry point. This Lambda is invoked on a schedule, and
-    the input payload is not used by the software.
+    AWS Lambda entry point. This Lambda is invoked on a schedule; the input
+    payload may optionally carry a "sources" list overriding the configured
+    report sources, or a "resend" date (or true for today) to resend an
+    already rendered report without recomputing it.
     """
-    logging.debug('Received event: %s; this should be blank', event)
+    logging.debug('Received event: %s', event)
 
     today = str(date.today())
-    logger.info('Searching logs for errors')
-    error_logs = search_error_logs()
 
-    analyses = analyze_messages(error_logs)
+    if isinstance(event, dict) and event.get('resend'):
+        try:
+            # Normalized since the date names the cached artifact
+            report_date = today if event['resend'] is True \
+                else str(date.fromisoformat(event['resend']))
+        except (TypeError, ValueError):
+            logger.error('Invalid resend date: %r', event['resend'])
+            return
+
+        raw_report = load_report_artifact(report_date)
+        if raw_report is None:
+            logger.error('No rendered report found for %s', report_date)
+            return
+
+        logger.info('Resending report for %s', report_date)
+        send_report(raw_report)
+        return
+
+    sources = resolve_sources(event)
+    deadline = time.monotonic() + \
+        context.get_remaining_time_in_millis() / 1000 - REPORT_TIME_MARGIN \
+        if context is not None else None
+
+    logger.info('Searching logs for errors in %d sources', len(sources))
+    source_reports = scan_sources(sources, deadline)
+
+    analyses = merge_source_reports(source_reports)
 
     logger.info('Generating csv')
-    csv_file = generate_csv_report(analyses)
+    csv_file = generate_csv_report(analyses, multi_source=len(sources) > 1)
 
     logger.info('Generating html')
-    html_report = generate_html_report(analyses)
+    html_report = generate_html_report(analyses, source_reports)
 
     message = MIMEMultipart()
     message['subject'] = f'{today} Daily Report'
@@ -66,16 +107,29 @@ def invoke(event, _):
     )
     message.attach(csv_attachment)
 
+    raw_report = message.as_string().encode()
+    send_report(raw_report)
+
+    # Caching only enables resends, so a failure must not lose the report
+    try:
+        store_report_artifact(today, raw_report)
+    except (OSError, BotoCoreError, ClientError) as ex:
+        logger.error('Failed to store report for %s: %s', today, ex)
+
+def send_report(raw_report: bytes):
+    """
+    Emails a rendered report to every address in NOTIFICATION_EMAILS
+    """
     for address in NOTIFICATION_EMAILS:
         logger.info('Sending emails to: %s', address)
         result = ses.send_email(
             ConfigurationSetName=SES_CONFIG_SET_NAME,
             FromEmailAddressIdentityArn=SES_SENDER_ARN,
-            FromEmailAddress=message['from'],
+            FromEmailAddress=f'{STAGE} Sigevent <noreply@nasa.gov>',
             Destination={'ToAddresses': [address]},
             Content={
                 'Raw': {
-                    'Data': message.as_string().encode()
+                    'Data': raw_report
                 }
             }
         )
@@ -84,13 +138,139 @@ def invoke(event, _):
 
     logger.debug('Finished sending emails')
 
-def search_error_logs():
+def store_report_artifact(report_date: str, raw_report: bytes):
+    """
+    Caches a rendered report under /tmp and, when a report bucket is
+    configured, in S3 so it can be resent from any container
+    """
+    os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+    path = os.path.join(REPORT_CACHE_DIR, f'{report_date}.eml')
+    with open(path, 'wb') as artifact:
+        artifact.write(raw_report)
+
+    if REPORT_BUCKET is not None:
+        s3.put_object(
+            Bucket=REPORT_BUCKET,
+            Key=f'reports/{report_date}.eml',
+            Body=raw_report
+        )
+
+def load_report_artifact(report_date: str) -> bytes | None:
+    """
+    Retrieves a cached rendered report; returns None if it does not exist
+    """
+    path = os.path.join(REPORT_CACHE_DIR, f'{report_date}.eml')
+    if os.path.exists(path):
+        with open(path, 'rb') as artifact:
+            return artifact.read()
+
+    if REPORT_BUCKET is None:
+        return None
+
+    try:
+        response = s3.get_object(
+            Bucket=REPORT_BUCKET,
+            Key=f'reports/{report_date}.eml'
+        )
+    except ClientError as ex:
+        if ex.response['Error']['Code'] == 'NoSuchKey':
+            return None
+        raise ex
+
+    return response['Body'].read()
+
+def resolve_sources(event) -> list[dict]:
+    """
+    Determines the sources to report on from the invocation payload, the
+    report_sources parameter or, by default, this stage's log group. Sources
+    are either log group names/ARNs or dicts with a name and log_group.
+    """
+    if isinstance(event, dict) and event.get('sources'):
+        sources = event['sources']
+    elif REPORT_SOURCES is not None:
+        sources = json.loads(REPORT_SOURCES)
+    else:
+        sources = [{'name': STAGE, 'log_group': CLOUDWATCH_LOG_GROUP}]
+
+    return [
+        source if isinstance(source, dict)
+        else {'name': source, 'log_group': source}
+        for source in sources
+    ]
+
+def scan_sources(sources: list[dict], deadline: float = None) -> list[dict]:
+    """
+    Scans and analyzes sources concurrently, sharing a pool of at most
+    REPORT_WORKERS threads. Each page of log events is folded into the
+    per-collection counts as it is read, so memory grows with the number
+    of collections rather than the number of events.
+    """
+    def scan_source(source):
+        analyses = analyze_messages(
+            iter_error_logs(source['log_group'], deadline))
+        partial = deadline is not None and time.monotonic() >= deadline
+
+        for analysis in analyses:
+            analysis['source'] = source['name']
+
+        return {
+            'name': source['name'],
+            'log_group': source['log_group'],
+            'analyses': analyses,
+            'partial': partial
+        }
+
+    workers = max(min(REPORT_WORKERS, len(sources)), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(scan_source, sources))
+
+def merge_source_reports(source_reports: list[dict]) -> list[dict]:
+    """
+    Combines the analyses of all sources into a single list ordered the
+    same way as analyze_messages, adding level totals to each source report
+    """
+    analyses = []
+    for report in source_reports:
+        report['level_counts'] = {level: 0 for level in EventLevel}
+        for analysis in report['analyses']:
+            for level, count in analysis['level_counts'].items():
+                report['level_counts'][level] += count
+
+        analyses.extend(report['analyses'])
+
+    return sorted(
+        analyses,
+        key=lambda x: (
+            x['level_counts']['ERROR'],
+            x['level_counts']['WARN'],
+            x['level_counts']['INFO'],
+            x['level_counts']['DEBUG']
+        ),
+        reverse=True
+    )
+
+def search_error_logs(log_group: str = None, deadline: float = None):
     '''
     Generates a list of dictionaries containing an analyzed version of log
     messages including the first timestamp within the logs, the last timestamp,
-    the message, and the number of times the message occurred
+    the message, and the number of times the message occurred. Defaults to
+    this stage's log group; log group ARNs are supported for cross-account
+    sources. Stops paginating early once the deadline (a time.monotonic
+    value) has passed.
+    '''
+    return list(iter_error_logs(log_group, deadline))
+
+def iter_error_logs(log_group: str = None,
+                    deadline: float = None) -> Iterator[EventMessage]:
+    '''
+    Lazily yields today's messages of a log group one page at a time; see
+    search_error_logs
     '''
-    logs: list = []
+    log_group = log_group or CLOUDWATCH_LOG_GROUP
+    log_group_kwargs = {'logGroupIdentifier': log_group} \
+        if log_group is not None and log_group.startswith('arn:') \
+        else {'logGroupName': log_group}
+
     now = datetime.now(timezone.utc)
     start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
     end_time = now.replace(hour=23, minute=59, second=59, microsecond=999999)
@@ -101,7 +281,7 @@ def search_error_logs():
     next_token = None
     while True:
         response = cloudwatchlogs.filter_log_events(
-            logGroupName=CLOUDWATCH_LOG_GROUP,
+            **log_group_kwargs,
             startTime=int(start_time.timestamp() * 1000),
             endTime=int(end_time.timestamp() * 1000),
             **({'nextToken': next_token} if next_token is not None else {})
@@ -110,17 +290,25 @@ def search_error_logs():
         logger.debug('CloudWatch logs response: %s', response)
 
         for event in response['events']:
-            logs.append(EventMessage.model_validate_json(event['message']))
+            yield parse_event_message(event['message'])
 
-        if 'nextToken' in response:
-            next_token = response['nextToken']
-        else:
-            return logs
+        if 'nextToken' not in response:
+            return
+
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning(
+                'Out of time scanning %s; report will be partial', log_group
+            )
+            return
 
-def analyze_messages(messages: list[EventMessage]) -> dict:
+        next_token = response['nextToken']
+
+def analyze_messages(messages: Iterable[EventMessage]) -> dict:
     '''
     Analyze messages and generate stats about the messages; ordering the
-    messages from most errors to least
+    messages from most errors to least. RollupMessages count as the number
+    of events they summarize. Messages are consumed in a single pass so
+    they can be streamed from iter_error_logs.
     '''
     analyses = {}
     for message in messages:
@@ -138,12 +326,15 @@ def analyze_messages(messages: list[EventMessage]) -> dict:
         level_counts = analysis['level_counts']
         category_counts = analysis['category_counts']
 
-        level_counts[message.event_level] += 1
+        weight = message.event_count \
+            if isinstance(message, RollupMessage) else 1
+
+        level_counts[message.event_level] += weight
 
         if message.category not in category_counts:
-            category_counts[message.category] = 1
+            category_counts[message.category] = weight
         else:
-            category_counts[message.category] += 1
+            category_counts[message.category] += weight
 
     # Sort collections by levels; starting at ERROR as the primary sort key
     # and going down to DEBUG as the lowest sort key
@@ -168,14 +359,17 @@ def analyze_messages(messages: list[EventMessage]) -> dict:
 
     return analyses
 
-def generate_csv_report(analyses: list[dict]) -> TemporaryFile:
+def generate_csv_report(analyses: list[dict],
+                        multi_source: bool = False) -> TemporaryFile:
     """
-    Generate an CSV report from an analysis dict
+    Generate an CSV report from an analysis dict; reports spanning multiple
+    sources include a source column
     """
     # pylint: disable=consider-using-with
     csv_file = NamedTemporaryFile(mode='r+', encoding='utf-8', delete=False)
 
     writer = csv.DictWriter(csv_file, fieldnames=[
+        *(['Source'] if multi_source else []),
         'Collection Name',
         'Errors',
         'Warnings',
@@ -191,6 +385,7 @@ def generate_csv_report(analyses: list[dict]) -> TemporaryFile:
         category_counts = analysis['category_counts']
 
         writer.writerow({
+            **({'Source': analysis['source']} if multi_source else {}),
             'Collection Name': name,
             'Errors': level_counts[EventLevel.ERROR],
             'Warnings': level_counts[EventLevel.WARN],
@@ -206,10 +401,12 @@ def generate_csv_report(analyses: list[dict]) -> TemporaryFile:
     csv_file.seek(0)
     return csv_file
 
-def generate_html_report(analyses: list[dict]) -> str:
+def generate_html_report(analyses: list[dict],
+                         source_reports: list[dict] = None) -> str:
     """
     Generates an HTML report using a predefined template and the analysis
-    data generated earlier
+    data generated earlier, with a per-source breakdown when the report
+    spans multiple sources
     """
 
     template = jinja_env.get_template('summary.html')
@@ -219,5 +416,6 @@ def generate_html_report(analyses: list[dict]) -> str:
         analyses=analyses,
         today=str(date.today()),
         num_collections=num_items,
-        total_num_collections=len(analyses)
+        total_num_collections=len(analyses),
+        source_reports=source_reports or []
     )
@@ -0,0 +1,140 @@
+"""
+Adapters unwrapping raw Sigevent messages from the envelopes of the
+different sources able to invoke the event handler. Every adapter yields
+RawEvents so all sources share the same batch processing path. A record
+whose envelope cannot be unwrapped yields a RawEvent without a message so
+only that record is failed instead of the whole batch.
+"""
+import base64
+from datetime import datetime, timezone
+import json
+import logging
+from typing import Callable, Iterator, NamedTuple, Optional
+
+
+class RawEvent(NamedTuple):
+    """
+    An unvalidated Sigevent message along with the timestamp its envelope
+    was received at, used when the message does not include a timestamp,
+    and the identifier of its source record for partial batch failures.
+    The message is None when the source record was malformed.
+    """
+    message: Optional[str]
+    timestamp: Optional[datetime]
+    record_id: Optional[str] = None
+
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE_ADAPTERS: dict[str, Callable[[object], Iterator[RawEvent]]] = {}
+
+
+def envelope_adapter(name: str):
+    """
+    Decorator registering an adapter under an envelope name
+    """
+    def register(adapter):
+        ENVELOPE_ADAPTERS[name] = adapter
+        return adapter
+
+    return register
+
+def unwrap(event, envelope: str) -> Iterator[RawEvent]:
+    """
+    Unwraps the raw messages of an event using the adapter registered for
+    its envelope
+    """
+    if envelope not in ENVELOPE_ADAPTERS:
+        raise ValueError(f'Unknown envelope: {envelope}')
+
+    return ENVELOPE_ADAPTERS[envelope](event)
+
+@envelope_adapter('sqs')
+def unwrap_sqs(event: dict) -> Iterator[RawEvent]:
+    """
+    SQS records wrapping SNS notifications; the default event handler input
+    """
+    for record in event['Records']:
+        try:
+            sns_record = json.loads(record['body'])
+            raw_event = RawEvent(
+                sns_record['Message'],
+                datetime.fromisoformat(sns_record['Timestamp']),
+                record.get('messageId')
+            )
+        except (KeyError, TypeError, ValueError) as ex:
+            logger.error(
+                'Malformed SQS record %s: %r', record.get('messageId'), ex
+            )
+            raw_event = RawEvent(None, None, record.get('messageId'))
+
+        yield raw_event
+
+@envelope_adapter('sns')
+def unwrap_sns(event: dict) -> Iterator[RawEvent]:
+    """
+    Raw SNS deliveries from a lambda subscription to the input topic
+    """
+    for record in event['Records']:
+        yield RawEvent(
+            record['Sns']['Message'],
+            datetime.fromisoformat(record['Sns']['Timestamp'])
+        )
+
+@envelope_adapter('kinesis')
+def unwrap_kinesis(event: dict) -> Iterator[RawEvent]:
+    """
+    Kinesis records carrying either a single message or a JSON array of
+    messages as their data
+    """
+    for record in event['Records']:
+        kinesis_record = record['kinesis']
+        sequence_number = kinesis_record.get('sequenceNumber')
+
+        try:
+            timestamp = datetime.fromtimestamp(
+                kinesis_record['approximateArrivalTimestamp'], timezone.utc
+            )
+            data = base64.b64decode(kinesis_record['data']).decode('utf-8')
+            if data.lstrip().startswith('['):
+                raw_events = [
+                    RawEvent(json.dumps(message), timestamp, sequence_number)
+                    for message in json.loads(data)
+                ]
+            else:
+                raw_events = [RawEvent(data, timestamp, sequence_number)]
+        except (KeyError, TypeError, ValueError) as ex:
+            logger.error(
+                'Malformed Kinesis record %s: %r', sequence_number, ex
+            )
+            raw_events = [RawEvent(None, None, sequence_number)]
+
+        yield from raw_events
+
+@envelope_adapter('eventbridge')
+def unwrap_eventbridge(event: dict) -> Iterator[RawEvent]:
+    """
+    An EventBridge event whose detail is the message
+    """
+    yield RawEvent(
+        json.dumps(event['detail']),
+        datetime.fromisoformat(event['time'])
+    )
+
+@envelope_adapter('direct')
+def unwrap_direct(event: list | dict) -> Iterator[RawEvent]:
+    """
+    A direct lambda invocation with a JSON array of messages, either as the
+    payload itself or under a "messages" key
+    """
+    messages = event.get('messages') if isinstance(event, dict) else event
+    if not isinstance(messages, list):
+        raise ValueError(
+            'Direct invocations must carry a JSON array of messages, either '
+            'as the payload or under a "messages" key'
+        )
+
+    received = datetime.now(timezone.utc)
+
+    for message in messages:
+        yield RawEvent(json.dumps(message), received)
@@ -0,0 +1,42 @@
+"""
+Classification of AWS errors shared by the notification outbox and the
+emitter client. This module must not import utilities, which loads the SSM
+parameters, so the client stays usable outside of the Sigevent lambdas.
+"""
+from botocore.exceptions import (
+    ClientError, ConnectionClosedError, ConnectTimeoutError,
+    EndpointConnectionError, ReadTimeoutError
+)
+
+
+TRANSIENT_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'TooManyRequestsException',
+    'LimitExceededException',
+    'SendingPausedException',
+    'KMSThrottling',
+    'ServiceUnavailable',
+    'InternalError',
+    'InternalFailure',
+    'InternalServiceError'
+}
+# Connection and timeout errors raised by botocore itself; other botocore
+# errors, such as invalid parameters or missing credentials, are permanent
+TRANSIENT_ERRORS = (
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError
+)
+
+
+def is_transient(ex: Exception) -> bool:
+    """
+    Determines whether a failed AWS call is worth retrying
+    """
+    if isinstance(ex, ClientError):
+        return ex.response['Error']['Code'] in TRANSIENT_ERROR_CODES
+
+    return isinstance(ex, TRANSIENT_ERRORS)
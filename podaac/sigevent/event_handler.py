@@ -1,38 +1,78 @@
 """Main handler for Sigevent messages"""
 from datetime import date, datetime, timedelta, timezone
 import hashlib
-import html
 import json
-from importlib import resources
+from typing import Iterable, NamedTuple, Optional
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from pydantic import ValidationError
-from podaac.sigevent.message import EventMessage, EventLevel
+from podaac.sigevent import envelopes, granule_index, outbox
+from podaac.sigevent.message import EventMessage, EventLevel, RollupMessage
+from podaac.sigevent.profiling import profiled
+from podaac.sigevent.rendering import render_notification
+from podaac.sigevent.routing import RoutingTable
 from podaac.sigevent.utilities import utils
 
 
 CLOUDWATCH_LOG_GROUP = utils.get_param('log_group')
 NOTIFICATION_EMAILS = json.loads(utils.get_param('notification_emails'))
+NOTIFICATION_ROUTES = utils.get_param('notification_routes')
 NOTIFICATION_TABLE_NAME = utils.get_param('notification_table_name')
-NOTIFICATION_TEMPLATE = resources.files(__package__).joinpath(
-    'resources', 'notification.html').read_text('utf-8')
-STAGE = utils.get_param('stage')
 MUTED_MODE = True if utils.get_param('muted_mode') == 'true' else False
 MAX_DAILY_WARNS = int(utils.get_param('max_daily_warns'))
-
-SES_REGION = utils.get_param('ses_region')
-SES_SENDER_ARN = utils.get_param('ses_sender_arn')
-SES_CONFIG_SET_NAME = utils.get_param('ses_config_set_name')
+ROLLUP_MODE = utils.get_param('rollup_mode') == 'true'
+ROLLUP_SAMPLE_SIZE = 5
 
 cloudwatchlogs = boto3.client('logs')
-ses = boto3.client('sesv2', region_name=SES_REGION)
 
 notification_table = boto3.resource('dynamodb').Table(NOTIFICATION_TABLE_NAME)
+routing_table = RoutingTable.compile(json.loads(NOTIFICATION_ROUTES)) \
+    if NOTIFICATION_ROUTES is not None else None
 logger = utils.get_logger(__name__)
 existing_log_streams = set()
 
+LEVEL_PRIORITIES = {
+    EventLevel.ERROR: 0,
+    EventLevel.WARN: 1,
+    EventLevel.INFO: 2,
+    EventLevel.DEBUG: 3
+}
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of processing a batch of raw events; accepted counts the raw
+    events which passed validation, rejected holds the positions of those
+    which did not and failed holds the source record identifiers of every
+    accepted event which failed processing or malformed record
+    """
+    failed: list[Optional[str]]
+    accepted: int = 0
+    rejected: tuple[int, ...] = ()
+
+    def batch_item_failures(self) -> dict:
+        '''
+        Lambda partial batch response reporting the failed records
+        '''
+        return {'batchItemFailures': [
+            {'itemIdentifier': record_id}
+            for record_id in dict.fromkeys(self.failed)
+            if record_id is not None
+        ]}
+
+    def summary(self) -> dict:
+        '''
+        Summary of the batch returned to direct invokers
+        '''
+        return {
+            'accepted': self.accepted,
+            'rejected': list(self.rejected),
+            'failed': len(self.failed)
+        }
 
+
+@profiled
 def invoke(event: dict, _):
     """
     AWS Lambda entry point
@@ -43,34 +83,212 @@ def invoke(event: dict, _):
        AWS SQS event message
     _ : object
         Context object. Not used by this lambda
+
+    Returns
+    -------
+    dict
+        Partial batch response listing the records to be redelivered
     """
     logger.debug('Event received: %s', event)
+    return process_batch(envelopes.unwrap(event, 'sqs')) \
+        .batch_item_failures()
 
-    for record in event['Records']:
-        logger.debug('Attempting to parse: %s', str(record['body']))
-        sns_record = json.loads(record['body'])
-        raw_event_message = json.loads(sns_record['Message'])
 
+@profiled
+def invoke_direct(event: list | dict, _):
+    """
+    AWS Lambda entry point for direct invocations carrying a JSON array of
+    EventMessages. Returns how many events were accepted, the positions of
+    the events rejected by validation and how many failed processing.
+    """
+    logger.debug('Event received: %s', event)
+    return process_batch(envelopes.unwrap(event, 'direct')).summary()
+
+
+@profiled
+def invoke_sns(event: dict, _):
+    """
+    AWS Lambda entry point for raw SNS deliveries
+    """
+    logger.debug('Event received: %s', event)
+    result = process_batch(envelopes.unwrap(event, 'sns'))
+    if result.failed:
+        raise RuntimeError(f'Failed to process {len(result.failed)} events')
+
+
+@profiled
+def invoke_kinesis(event: dict, _):
+    """
+    AWS Lambda entry point for Kinesis stream records; failed records are
+    reported by sequence number as a partial batch response
+    """
+    logger.debug('Event received: %s', event)
+    return process_batch(envelopes.unwrap(event, 'kinesis')) \
+        .batch_item_failures()
+
+
+@profiled
+def invoke_eventbridge(event: dict, _):
+    """
+    AWS Lambda entry point for EventBridge events
+    """
+    logger.debug('Event received: %s', event)
+    result = process_batch(envelopes.unwrap(event, 'eventbridge'))
+    if result.failed:
+        raise RuntimeError(f'Failed to process {len(result.failed)} events')
+
+
+def process_batch(raw_events: Iterable[envelopes.RawEvent]) -> BatchResult:
+    """
+    Validates a batch of raw events from any envelope and processes the
+    resulting EventMessages in priority order. A message failing processing
+    does not stop the batch; its source records are reported as failed so
+    only they are redelivered, as are records whose envelope is malformed.
+    Messages failing validation are logged and dropped since redelivering
+    them can never succeed.
+    """
+    messages = []
+    # Source record identifiers by message identity and by rollup group
+    record_ids = {}
+    group_record_ids = {}
+    # Every granule of a rollup group, beyond the samples kept in the record
+    group_granules = {}
+    rejected = []
+    failed = []
+    for index, raw_event in enumerate(raw_events):
+        # Malformed envelopes are redelivered and eventually dead-lettered
+        # rather than dropped
+        if raw_event.message is None:
+            failed.append(raw_event.record_id)
+            continue
+
+        message = parse_raw_event(raw_event)
+        if message is None:
+            rejected.append(index)
+            continue
+        messages.append(message)
+        record_ids[id(message)] = [raw_event.record_id]
+
+    if ROLLUP_MODE:
+        for message in messages:
+            key = rollup_key(message)
+            group_record_ids.setdefault(key, []) \
+                .extend(record_ids[id(message)])
+            if message.granule_name is not None:
+                group_granules.setdefault(key, {})[message.granule_name] = None
+        messages = rollup_messages(messages)
+
+    for message in prioritize_messages(messages):
+        granule_names = group_granules.get(rollup_key(message), {}).keys() \
+            if isinstance(message, RollupMessage) else None
         try:
-            message = EventMessage.model_validate_json(sns_record['Message'])
-
-            # Use SNS timestamp if message doesn't include timestamp
-            if message.timestamp is None:
-                logger.debug(
-                    'Message does not include timestamp; using SNS timestamp'
-                )
-                message = message.model_copy(update={
-                    'timestamp': datetime.fromisoformat(sns_record['Timestamp'])
-                })
-
-            process_event_message(message)
-        except ValidationError as ex:
-            logger.error(
-                'Failed to validate message:\n%s\n%s', raw_event_message, ex
+            process_event_message(message, granule_names=granule_names)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception('Failed to process message: %s', message)
+            failed.extend(
+                group_record_ids[rollup_key(message)]
+                if isinstance(message, RollupMessage)
+                else record_ids[id(message)]
             )
 
+    return BatchResult(
+        failed=failed, accepted=len(record_ids), rejected=tuple(rejected))
+
+def parse_raw_event(raw_event: envelopes.RawEvent) -> EventMessage | None:
+    """
+    Parses a raw event into an EventMessage; returns None if the message
+    fails validation
+    """
+    logger.debug('Attempting to parse: %s', raw_event.message)
+
+    try:
+        message = EventMessage.model_validate_json(raw_event.message)
+    except ValidationError as ex:
+        logger.error(
+            'Failed to validate message:\n%s\n%s', raw_event.message, ex
+        )
+        return None
+
+    # Use envelope timestamp if message doesn't include timestamp
+    if message.timestamp is None:
+        logger.debug(
+            'Message does not include timestamp; using envelope timestamp'
+        )
+        message = message.model_copy(update={
+            'timestamp': raw_event.timestamp
+        })
+
+    return message
 
-def process_event_message(message: EventMessage):
+def prioritize_messages(messages: list[EventMessage]) -> list[EventMessage]:
+    """
+    Orders a batch of messages by descending level so ERROR and WARN
+    notifications are never held up behind DEBUG and INFO traffic. The
+    sort is stable, preserving arrival order within a level.
+    """
+    return sorted(
+        messages,
+        key=lambda message: LEVEL_PRIORITIES[message.event_level]
+    )
+
+def rollup_key(message: EventMessage) -> tuple:
+    """
+    The attributes shared by messages collapsed into a single RollupMessage
+    """
+    return (
+        message.collection_name,
+        message.category,
+        message.subject,
+        message.event_level
+    )
+
+def rollup_messages(messages: list[EventMessage]) -> list[EventMessage]:
+    """
+    Collapses DEBUG and INFO messages of a batch sharing a collection,
+    category, subject and level into a single RollupMessage carrying the
+    number of events summarized, the first and last timestamps and a few
+    sample granules. ERROR and WARN messages, as well as groups of a single
+    message, pass through untouched.
+    """
+    passthrough = []
+    groups = {}
+    for message in messages:
+        if message.event_level in (EventLevel.ERROR, EventLevel.WARN):
+            passthrough.append(message)
+            continue
+
+        groups.setdefault(rollup_key(message), []).append(message)
+
+    for group in groups.values():
+        if len(group) == 1:
+            passthrough.append(group[0])
+            continue
+
+        timestamps = [message.timestamp for message in group]
+        sample_granules = []
+        for message in group:
+            if len(sample_granules) >= ROLLUP_SAMPLE_SIZE:
+                break
+            if message.granule_name is not None and \
+                    message.granule_name not in sample_granules:
+                sample_granules.append(message.granule_name)
+
+        passthrough.append(RollupMessage(
+            **group[0].model_dump(exclude={'granule_name', 'timestamp'}),
+            timestamp=min(timestamps),
+            event_count=len(group),
+            first_timestamp=min(timestamps),
+            last_timestamp=max(timestamps),
+            sample_granules=tuple(sample_granules)
+        ))
+
+    logger.debug(
+        'Rolled up %d messages into %d records', len(messages), len(passthrough)
+    )
+    return passthrough
+
+def process_event_message(message: EventMessage,
+                          granule_names: Iterable[str] = None):
     """
     Process a singular EventMessage performing the storage of the message in
     the CloudWatch log group and sending out a notification if the required
@@ -84,6 +302,9 @@ def process_event_message(message: EventMessage):
     
     For all else, notifications are just logged in CloudWatch without a
     notification.
+
+    granule_names overrides the granules the message is indexed under;
+    used to index every granule summarized by a RollupMessage.
     """
 
     # Create log stream if not exist or nop on already existing
@@ -113,6 +334,14 @@ def process_event_message(message: EventMessage):
     )
     logger.debug('put_log_events response: %s', response)
 
+    # Index granule events for direct lookups; best-effort so an index
+    # failure never blocks notifications or causes the event to be re-logged
+    try:
+        granule_index.index_event(
+            message, message.collection_name, granule_names)
+    except (BotoCoreError, ClientError) as ex:
+        logger.warning('Failed to index granule event: %s', ex)
+
     # Bypass if we're in muted mode
     if MUTED_MODE:
         return
@@ -138,34 +367,34 @@ def process_event_message(message: EventMessage):
 def send_notification(message: EventMessage):
     """
     Sends notifications to interested parties via SES using a predefined
-    email template
+    email template. Recipients are resolved from the routing table when
+    notification routes are configured, otherwise every address in
+    NOTIFICATION_EMAILS is notified. Sends failing with a transient error,
+    such as SES throttling, are deferred to the notification outbox.
     """
-    today = date.today()
+    recipients = sorted(routing_table.resolve(message)) \
+        if routing_table is not None else NOTIFICATION_EMAILS
+
+    if not recipients:
+        logger.debug('No recipients routed for message')
+        return
+
+    notification = render_notification(message)
     
-    for address in NOTIFICATION_EMAILS:
+    for address in recipients:
         logger.debug('Sending email to: %s', address)
-        
-        ses.send_email(
-            ConfigurationSetName=SES_CONFIG_SET_NAME,
-            FromEmailAddressIdentityArn=SES_SENDER_ARN,
-            FromEmailAddress=f'{STAGE} Sigevent <noreply@nasa.gov>',
-            Destination={'ToAddresses': [address]},
-            Content={
-                'Simple': {
-                    'Subject': {
-                        'Data': f'[{message.category}] {today} {message.collection_name}',
-                        'Charset': 'UTF-8'
-                    },
-                    'Body': {
-                        'Html': {
-                            'Data': NOTIFICATION_TEMPLATE.format(
-                                raw_message=html.escape(message.model_dump_json())),
-                            'Charset': 'UTF-8'
-                        }
-                    }
-                }
-            }
-        )
+
+        try:
+            outbox.send_email(
+                address, notification.subject, notification.body)
+        except (BotoCoreError, ClientError) as ex:
+            if not outbox.is_transient(ex):
+                raise ex
+
+            logger.warning(
+                'Deferring email to %s to the outbox: %s', address, ex
+            )
+            outbox.enqueue(address, notification.subject, notification.body)
         
     logger.debug('Sending finished')
 
@@ -0,0 +1,169 @@
+"""
+Secondary index from granule names to the Sigevent records emitted for them.
+
+The event handler writes a compact pointer for every event which carries a
+granule_name into a DynamoDB table so a granule's history can be retrieved
+with a single key lookup instead of scanning the whole CloudWatch log group.
+This module is also runnable as a CLI for operators:
+
+    python -m podaac.sigevent.granule_index <granule_name> [--full]
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+from typing import Iterable
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from podaac.sigevent.message import (
+    EventMessage, RollupMessage, parse_event_message
+)
+from podaac.sigevent.utilities import utils
+
+
+CLOUDWATCH_LOG_GROUP = utils.get_param('log_group')
+GRANULE_INDEX_TABLE_NAME = utils.get_param('granule_index_table_name')
+GRANULE_INDEX_TTL_DAYS = int(utils.get_param('granule_index_ttl_days') or 30)
+
+cloudwatchlogs = boto3.client('logs')
+granule_table = boto3.resource('dynamodb').Table(GRANULE_INDEX_TABLE_NAME) \
+    if GRANULE_INDEX_TABLE_NAME is not None else None
+logger = utils.get_logger(__name__)
+
+
+def index_event(message: EventMessage, log_stream: str,
+                granule_names: Iterable[str] = None):
+    """
+    Writes an index entry pointing at the log record of an EventMessage.
+    Messages without a granule_name are not indexed, and indexing is a
+    no-op when no index table is configured. RollupMessages are indexed
+    under every granule they summarize when granule_names is given, and
+    under their sample granules otherwise.
+    """
+    if granule_names is not None:
+        granule_names = tuple(granule_names)
+    elif isinstance(message, RollupMessage):
+        granule_names = message.sample_granules
+    elif message.granule_name is not None:
+        granule_names = (message.granule_name,)
+    else:
+        granule_names = ()
+
+    if granule_table is None or not granule_names:
+        return
+
+    timestamp = int(message.timestamp.timestamp() * 1000)
+    expiration = datetime.now(timezone.utc) + \
+        timedelta(days=GRANULE_INDEX_TTL_DAYS)
+
+    # The event hash keeps entries for events sharing a millisecond distinct
+    # while still sorting chronologically within a granule
+    event_hash = hashlib.sha1(
+        bytes(message.model_dump_json(), 'utf-8'),
+        usedforsecurity=False
+    ).hexdigest()[:12]
+
+    # Rollups can cover thousands of granules; the batch writer sends their
+    # entries 25 at a time instead of one request each
+    with granule_table.batch_writer() as batch:
+        for granule_name in granule_names:
+            batch.put_item(Item={
+                'granule_name': granule_name,
+                'event_key': f'{timestamp:013d}#{event_hash}',
+                'timestamp': timestamp,
+                'event_level': message.event_level.value,
+                'category': message.category,
+                'subject': message.subject,
+                'collection_name': message.collection_name,
+                'log_group': CLOUDWATCH_LOG_GROUP,
+                'log_stream': log_stream,
+                'expiration': int(expiration.timestamp())
+            })
+
+def lookup_granule_events(granule_name: str, limit: int = None,
+                          newest_first: bool = False) -> list[dict]:
+    """
+    Retrieves the index entries of a granule ordered by event timestamp
+    """
+    if granule_table is None:
+        raise RuntimeError('Granule index table is not configured')
+
+    records = []
+    last_key = None
+    while True:
+        response = granule_table.query(
+            KeyConditionExpression=Key('granule_name').eq(granule_name),
+            ScanIndexForward=not newest_first,
+            **({'ExclusiveStartKey': last_key} if last_key is not None else {}),
+            **({'Limit': limit - len(records)} if limit is not None else {})
+        )
+        logger.debug('Granule index query response: %s', response)
+
+        for item in response['Items']:
+            records.append({
+                'timestamp': int(item['timestamp']),
+                'event_level': item['event_level'],
+                'category': item['category'],
+                'subject': item['subject'],
+                'collection_name': item['collection_name'],
+                'log_group': item['log_group'],
+                'log_stream': item['log_stream']
+            })
+
+        if limit is not None and len(records) >= limit:
+            return records
+        if 'LastEvaluatedKey' in response:
+            last_key = response['LastEvaluatedKey']
+        else:
+            return records
+
+def fetch_event(record: dict) -> EventMessage | None:
+    """
+    Follows the log pointer of an index entry to retrieve the full
+    EventMessage from CloudWatch
+    """
+    response = cloudwatchlogs.get_log_events(
+        logGroupName=record['log_group'],
+        logStreamName=record['log_stream'],
+        startTime=record['timestamp'],
+        endTime=record['timestamp'] + 1,
+        startFromHead=True
+    )
+
+    for event in response['events']:
+        message = parse_event_message(event['message'])
+        if message.event_level == record['event_level'] and \
+                message.subject == record['subject']:
+            return message
+
+    return None
+
+def main(argv=None):
+    """
+    CLI entry point printing the event history of a granule as JSON lines
+    """
+    parser = argparse.ArgumentParser(
+        description='Look up the Sigevent history of a granule')
+    parser.add_argument('granule_name')
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--newest-first', action='store_true')
+    parser.add_argument(
+        '--full', action='store_true',
+        help='Retrieve the full event messages from CloudWatch')
+    args = parser.parse_args(argv)
+
+    records = lookup_granule_events(
+        args.granule_name, limit=args.limit, newest_first=args.newest_first)
+
+    for record in records:
+        if args.full:
+            message = fetch_event(record)
+            print(message.model_dump_json() if message is not None
+                  else json.dumps(record))
+        else:
+            print(json.dumps(record))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 """Classes representing input messages from Sigevent emitters"""
 from datetime import datetime
 from enum import StrEnum
+import json
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict
@@ -57,3 +58,26 @@ class EventMessage(BaseModel):
                f'executor={self.executor}, ' \
                f'timestamp={self.timestamp}' \
                f')'
+
+
+class RollupMessage(EventMessage):
+    """
+    A summary record standing in for several low severity EventMessages
+    which share a collection, category, subject and level
+    """
+    event_count: int
+    first_timestamp: datetime
+    last_timestamp: datetime
+    sample_granules: tuple[str, ...] = ()
+
+
+def parse_event_message(raw_message: str) -> EventMessage:
+    """
+    Parses a stored Sigevent log record into either an EventMessage or a
+    RollupMessage depending on its contents
+    """
+    data = json.loads(raw_message)
+    if 'event_count' in data:
+        return RollupMessage.model_validate(data)
+
+    return EventMessage.model_validate(data)
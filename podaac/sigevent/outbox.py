@@ -0,0 +1,162 @@
+"""
+Durable outbox for notifications which could not be delivered by SES.
+
+Sends failing with throttling or other transient errors are written to a
+DynamoDB table instead of failing the event handler invocation. A scheduled
+lambda drains the outbox, retrying each notification with exponential
+backoff until it is delivered or runs out of attempts.
+"""
+from datetime import datetime, timedelta, timezone
+import hashlib
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import BotoCoreError, ClientError
+from podaac.sigevent.errors import is_transient
+from podaac.sigevent.utilities import utils
+
+
+OUTBOX_TABLE_NAME = utils.get_param('outbox_table_name')
+OUTBOX_MAX_ATTEMPTS = int(utils.get_param('outbox_max_attempts') or 10)
+OUTBOX_BASE_DELAY = 60
+OUTBOX_MAX_DELAY = 3600
+OUTBOX_RETENTION_DAYS = 2
+STAGE = utils.get_param('stage')
+
+SES_REGION = utils.get_param('ses_region')
+SES_SENDER_ARN = utils.get_param('ses_sender_arn')
+SES_CONFIG_SET_NAME = utils.get_param('ses_config_set_name')
+
+ses = boto3.client('sesv2', region_name=SES_REGION)
+outbox_table = boto3.resource('dynamodb').Table(OUTBOX_TABLE_NAME)
+logger = utils.get_logger(__name__)
+
+
+def invoke(event, _):
+    """
+    AWS Lambda entry point. This Lambda is invoked on a schedule, and
+    the input payload is not used by the software.
+    """
+    logger.debug('Received event: %s; this should be blank', event)
+    drain()
+
+def send_email(address: str, subject: str, body: str):
+    """
+    Sends a single notification email via SES
+    """
+    return ses.send_email(
+        ConfigurationSetName=SES_CONFIG_SET_NAME,
+        FromEmailAddressIdentityArn=SES_SENDER_ARN,
+        FromEmailAddress=f'{STAGE} Sigevent <noreply@nasa.gov>',
+        Destination={'ToAddresses': [address]},
+        Content={
+            'Simple': {
+                'Subject': {
+                    'Data': subject,
+                    'Charset': 'UTF-8'
+                },
+                'Body': {
+                    'Html': {
+                        'Data': body,
+                        'Charset': 'UTF-8'
+                    }
+                }
+            }
+        }
+    )
+
+def enqueue(address: str, subject: str, body: str):
+    """
+    Stores a notification in the outbox for a deferred send. A notification
+    already waiting in the outbox for the same address is not duplicated.
+    """
+    notification_id = hashlib.sha1(
+        bytes(address, 'utf-8') + bytes(subject, 'utf-8') + \
+        bytes(body, 'utf-8'),
+        usedforsecurity=False
+    ).hexdigest()
+
+    now = datetime.now(timezone.utc)
+    expiration = now + timedelta(days=OUTBOX_RETENTION_DAYS)
+
+    try:
+        outbox_table.put_item(
+            Item={
+                'notification_id': notification_id,
+                'address': address,
+                'subject': subject,
+                'body': body,
+                'attempts': 0,
+                'next_attempt': int(now.timestamp()) + OUTBOX_BASE_DELAY,
+                'expiration': int(expiration.timestamp())
+            },
+            ConditionExpression='attribute_not_exists(notification_id)'
+        )
+    except ClientError as ex:
+        if ex.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            logger.debug('Notification already in outbox; no-op')
+        else:
+            raise ex
+
+def drain():
+    """
+    Attempts to deliver every outbox notification whose next attempt is
+    due, rescheduling transient failures with exponential backoff
+    """
+    now = int(datetime.now(timezone.utc).timestamp())
+
+    last_key = None
+    while True:
+        response = outbox_table.scan(
+            FilterExpression=Attr('next_attempt').lte(now),
+            **({'ExclusiveStartKey': last_key} if last_key is not None else {})
+        )
+        logger.debug('Outbox scan response: %s', response)
+
+        for item in response['Items']:
+            deliver(item, now)
+
+        if 'LastEvaluatedKey' in response:
+            last_key = response['LastEvaluatedKey']
+        else:
+            break
+
+    logger.debug('Finished draining outbox')
+
+def deliver(item: dict, now: int):
+    """
+    Sends a single outbox notification, removing it from the outbox once it
+    was sent or can no longer be retried
+    """
+    key = {'notification_id': item['notification_id']}
+    attempts = int(item['attempts']) + 1
+
+    try:
+        send_email(item['address'], item['subject'], item['body'])
+    except (BotoCoreError, ClientError) as ex:
+        if is_transient(ex) and attempts < OUTBOX_MAX_ATTEMPTS:
+            delay = min(OUTBOX_BASE_DELAY * 2 ** attempts, OUTBOX_MAX_DELAY)
+            logger.info(
+                'Deferring notification to %s for %ds: %s',
+                item['address'], delay, ex
+            )
+            outbox_table.update_item(
+                Key=key,
+                UpdateExpression='SET attempts = :attempts, '
+                                 'next_attempt = :next_attempt',
+                ExpressionAttributeValues={
+                    ':attempts': attempts,
+                    ':next_attempt': now + delay
+                }
+            )
+            return
+
+        logger.error(
+            'Dropping notification to %s after %d attempts: %s',
+            item['address'], attempts, ex
+        )
+        outbox_table.delete_item(Key=key)
+        return
+
+    logger.info('Delivered deferred notification to %s', item['address'])
+    outbox_table.delete_item(Key=key)
@@ -0,0 +1,135 @@
+"""
+Opt-in profiling of lambda entry points.
+
+When the profiling_enabled parameter is 'true', decorated handlers run under
+cProfile and tracemalloc and emit a compact JSON record of their top CPU
+hotspots and allocation sites. When disabled, the decorator returns the
+handler unchanged so profiling costs nothing.
+"""
+import cProfile
+from datetime import datetime, timezone
+import functools
+import json
+import os
+import pstats
+import time
+import tracemalloc
+
+from podaac.sigevent.utilities import utils
+
+
+PROFILING_ENABLED = utils.get_param('profiling_enabled') == 'true'
+PROFILING_TOP_N = int(utils.get_param('profiling_top_n') or 20)
+PROFILING_OUTPUT_DIR = utils.get_param('profiling_output_dir')
+
+logger = utils.get_logger(__name__)
+
+
+def profiled(handler):
+    """
+    Decorator profiling a lambda entry point when profiling is enabled
+    """
+    if not PROFILING_ENABLED:
+        return handler
+
+    return profile_handler(handler, PROFILING_TOP_N, PROFILING_OUTPUT_DIR)
+
+def profile_handler(handler, top_n: int = PROFILING_TOP_N,
+                    output_dir: str = None):
+    """
+    Wraps a lambda entry point with cProfile and tracemalloc, reporting the
+    top_n hotspots and allocation sites after every invocation
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        profiler = cProfile.Profile()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return handler(event, context)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start
+
+            # Profiling must never change the outcome of the handler, so
+            # reporting failures are only logged
+            try:
+                write_report(
+                    build_report(handler, context, profiler, duration, top_n),
+                    output_dir
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception('Failed to report profile')
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+
+    return wrapper
+
+def build_report(handler, context, profiler: cProfile.Profile,
+                 duration: float, top_n: int) -> dict:
+    """
+    Builds the profiling report of a single invocation
+    """
+    snapshot = tracemalloc.take_snapshot()
+    _, peak_memory = tracemalloc.get_traced_memory()
+
+    return {
+        'handler': f'{handler.__module__}.{handler.__qualname__}',
+        'request_id': getattr(context, 'aws_request_id', None),
+        'duration': round(duration, 3),
+        'peak_memory': peak_memory,
+        'hotspots': collect_hotspots(profiler, top_n),
+        'allocations': collect_allocations(snapshot, top_n)
+    }
+
+def collect_hotspots(profiler: cProfile.Profile, top_n: int) -> list[dict]:
+    """
+    Summarizes the functions with the highest cumulative time
+    """
+    stats = pstats.Stats(profiler).stats
+    entries = sorted(
+        stats.items(),
+        key=lambda item: item[1][3],
+        reverse=True
+    )[:top_n]
+
+    return [{
+        'function': f'{filename}:{line}({name})',
+        'calls': calls,
+        'total_time': round(total_time, 6),
+        'cumulative_time': round(cumulative_time, 6)
+    } for (filename, line, name), (_, calls, total_time, cumulative_time, _)
+        in entries]
+
+def collect_allocations(snapshot: tracemalloc.Snapshot,
+                        top_n: int) -> list[dict]:
+    """
+    Summarizes the source lines holding the most allocated memory
+    """
+    return [{
+        'location': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+        'size': stat.size,
+        'count': stat.count
+    } for stat in snapshot.statistics('lineno')[:top_n]]
+
+def write_report(report: dict, output_dir: str = None):
+    """
+    Logs a profiling report as a single compact record, additionally
+    writing it to output_dir as a JSON artifact when provided
+    """
+    record = json.dumps(report, separators=(',', ':'))
+    logger.info('Profile: %s', record)
+
+    if output_dir is None:
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    path = os.path.join(output_dir, f'{report["handler"]}-{timestamp}.json')
+    with open(path, 'w', encoding='utf-8') as artifact:
+        artifact.write(record)
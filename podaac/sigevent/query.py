@@ -0,0 +1,192 @@
+"""
+Collection-scoped read API for Sigevent events stored in CloudWatch.
+
+Events are stored in one log stream per collection, so queries target the
+collection's stream directly and push level filtering down to CloudWatch
+through a filter pattern rather than filtering client side.
+"""
+from collections import OrderedDict
+from datetime import datetime
+import time
+from typing import Iterator, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+from pydantic import BaseModel, ConfigDict
+from podaac.sigevent.message import (
+    EventMessage, EventLevel, parse_event_message
+)
+from podaac.sigevent.utilities import utils
+
+
+CLOUDWATCH_LOG_GROUP = utils.get_param('log_group')
+QUERY_CACHE_SIZE = int(utils.get_param('query_cache_size') or 32)
+QUERY_CACHE_TTL = int(utils.get_param('query_cache_ttl') or 60)
+
+cloudwatchlogs = boto3.client('logs')
+logger = utils.get_logger(__name__)
+
+
+class EventQuery(BaseModel):
+    """
+    A query for the events of a single collection within a time range,
+    optionally restricted to a set of levels
+    """
+    model_config = ConfigDict(frozen=True)
+
+    collection_name: str
+    start_time: datetime
+    end_time: datetime
+    levels: Optional[frozenset[EventLevel]] = None
+
+    def filter_pattern(self) -> Optional[str]:
+        """
+        Generates a CloudWatch JSON filter pattern matching the query's
+        levels
+        """
+        if not self.levels:
+            return None
+
+        return '{ ' + ' || '.join(
+            f'($.event_level = "{level.value}")'
+            for level in sorted(self.levels)
+        ) + ' }'
+
+
+class EventIterator:
+    """
+    Lazily iterates over the events matching an EventQuery, fetching a page
+    from CloudWatch only once the previous page has been consumed. The
+    cursor property can be passed to query_events to resume at the first
+    page which was not fully consumed. Iterating over events advances the
+    cursor only once every event of a page was consumed, so stopping
+    partway through a page replays that page on resume; use pages() to
+    resume with page granularity.
+    """
+
+    def __init__(self, query: EventQuery, cursor: str = None,
+                 page_size: int = None, log_group: str = None):
+        self.query = query
+        self.cursor = cursor
+        self.page_size = page_size
+        self.log_group = log_group or CLOUDWATCH_LOG_GROUP
+        self._exhausted = False
+
+    def __iter__(self) -> Iterator[EventMessage]:
+        while not self._exhausted:
+            page, next_token = self._fetch_page()
+            yield from page
+            self._advance(next_token)
+
+    def pages(self) -> Iterator[list[EventMessage]]:
+        """
+        Iterates over the query results page by page; the cursor advances
+        past a page as soon as it is handed out
+        """
+        while not self._exhausted:
+            page, next_token = self._fetch_page()
+            self._advance(next_token)
+            yield page
+
+    def _advance(self, next_token: Optional[str]):
+        self.cursor = next_token
+        self._exhausted = next_token is None
+
+    def _fetch_page(self) -> tuple[list[EventMessage], Optional[str]]:
+        filter_pattern = self.query.filter_pattern()
+        try:
+            response = cloudwatchlogs.filter_log_events(
+                logGroupName=self.log_group,
+                logStreamNames=[self.query.collection_name],
+                startTime=int(self.query.start_time.timestamp() * 1000),
+                endTime=int(self.query.end_time.timestamp() * 1000),
+                **({'filterPattern': filter_pattern}
+                   if filter_pattern is not None else {}),
+                **({'limit': self.page_size}
+                   if self.page_size is not None else {}),
+                **({'nextToken': self.cursor}
+                   if self.cursor is not None else {})
+            )
+        except ClientError as ex:
+            # Collections which never emitted an event have no log stream
+            if ex.response['Error']['Code'] == 'ResourceNotFoundException':
+                logger.debug('No log stream for %s', self.query.collection_name)
+                return [], None
+            raise ex
+
+        logger.debug('CloudWatch logs response: %s', response)
+
+        page = [
+            parse_event_message(event['message'])
+            for event in response['events']
+        ]
+        return page, response.get('nextToken')
+
+
+class QueryCache:
+    """
+    A small LRU cache whose entries expire after a fixed time-to-live
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        '''
+        Returns the cached value for a key or None if missing or expired
+        '''
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        '''
+        Caches a value, evicting the least recently used entry when full
+        '''
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        '''
+        Removes all entries from the cache
+        '''
+        self._entries.clear()
+
+
+query_cache = QueryCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL)
+
+
+def query_events(query: EventQuery, cursor: str = None,
+                 page_size: int = None) -> EventIterator:
+    """
+    Returns a lazy iterator over the events matching a query, optionally
+    resuming from a cursor returned by a previous iterator
+    """
+    return EventIterator(query, cursor=cursor, page_size=page_size)
+
+def fetch_events(query: EventQuery) -> list[EventMessage]:
+    """
+    Retrieves every event matching a query; repeated queries are served
+    from the query cache until its entries expire
+    """
+    events = query_cache.get(query)
+    if events is not None:
+        logger.debug('Query cache hit: %s', query)
+        return list(events)
+
+    events = tuple(query_events(query))
+    query_cache.put(query, events)
+    return list(events)
@@ -0,0 +1,93 @@
+"""
+Rendering of notification emails and report templates.
+
+Jinja templates are loaded from modules precompiled at build time when the
+package ships them, and otherwise compiled from source with their bytecode
+cached under /tmp so only the first invocation of a container parses them.
+Precompile the templates into a build with:
+
+    python -m podaac.sigevent.rendering <target_directory>
+
+The build runs this after replacing pydantic with Linux wheels, so the
+module must stay importable without pydantic; EventMessage is only imported
+for type checking.
+"""
+from datetime import date
+import html
+from importlib import resources
+import os
+import sys
+import tempfile
+from typing import TYPE_CHECKING, NamedTuple
+
+import jinja2
+
+if TYPE_CHECKING:
+    from podaac.sigevent.message import EventMessage
+
+NOTIFICATION_TEMPLATE = resources.files(__package__).joinpath(
+    'resources', 'notification.html').read_text('utf-8')
+COMPILED_TEMPLATES_DIR = os.path.join(
+    os.path.dirname(__file__), 'resources', 'compiled')
+BYTECODE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'sigevent-jinja')
+REPORT_TEMPLATES = ('summary.html',)
+
+
+class RenderedNotification(NamedTuple):
+    """
+    The subject and HTML body of a notification email
+    """
+    subject: str
+    body: str
+
+
+def create_jinja_env() -> jinja2.Environment:
+    """
+    Creates the Jinja environment for the report templates, preferring
+    precompiled templates and falling back to a /tmp bytecode cache
+    """
+    source_loader = jinja2.PackageLoader(__package__, 'resources')
+
+    if os.path.isdir(COMPILED_TEMPLATES_DIR):
+        return jinja2.Environment(loader=jinja2.ChoiceLoader([
+            jinja2.ModuleLoader(COMPILED_TEMPLATES_DIR),
+            source_loader
+        ]))
+
+    os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+    return jinja2.Environment(
+        loader=source_loader,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(BYTECODE_CACHE_DIR)
+    )
+
+def precompile_templates(target: str):
+    """
+    Compiles the report templates into Python modules loadable by
+    jinja2.ModuleLoader
+    """
+    env = jinja2.Environment(
+        loader=jinja2.PackageLoader(__package__, 'resources'))
+    env.compile_templates(
+        target,
+        filter_func=lambda name: name in REPORT_TEMPLATES,
+        zip=None,
+        ignore_errors=False
+    )
+
+def render_notification(message: 'EventMessage',
+                        today: date = None) -> RenderedNotification:
+    """
+    Renders the notification email of a message; rendered once per message
+    and shared by all of its recipients
+    """
+    today = today or date.today()
+
+    return RenderedNotification(
+        subject=f'[{message.category}] {today} {message.collection_name}',
+        body=NOTIFICATION_TEMPLATE.format(
+            raw_message=html.escape(message.model_dump_json()))
+    )
+
+
+if __name__ == '__main__':
+    precompile_templates(sys.argv[1])
@@ -0,0 +1,143 @@
+"""
+Notification routing from collections, categories and levels to recipients.
+
+Routing rules are compiled once into a trie over their collection glob
+patterns. Each trie node stores a bitmask of the levels routed through it
+along with its recipients indexed by level and category, so resolving the
+recipients of a message walks the collection name once instead of testing
+every rule.
+"""
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+from podaac.sigevent.message import EventMessage, EventLevel
+
+LEVEL_BITS = {
+    EventLevel.DEBUG: 1,
+    EventLevel.INFO: 2,
+    EventLevel.WARN: 4,
+    EventLevel.ERROR: 8
+}
+
+
+class RouteRule(BaseModel):
+    """
+    A routing rule sending messages of matching collections and categories
+    at or above min_level to its recipients. Collection patterns support
+    the * and ? glob wildcards; omitting categories matches all categories.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    collections: list[str] = ['*']
+    categories: Optional[list[str]] = None
+    min_level: EventLevel = EventLevel.DEBUG
+    recipients: list[str]
+
+    def level_mask(self) -> int:
+        """
+        Bitmask of the levels at or above min_level
+        """
+        mask = 0
+        for level, bit in LEVEL_BITS.items():
+            if self.min_level <= level:
+                mask |= bit
+        return mask
+
+
+class _TrieNode:  # pylint: disable=too-few-public-methods
+    """
+    Node of the collection pattern trie; literal characters, ? and * each
+    lead to their own child
+    """
+    __slots__ = ('children', 'level_mask', 'recipients')
+
+    def __init__(self):
+        self.children = {}
+        self.level_mask = 0
+        # level bit -> category (None for any category) -> recipients
+        self.recipients = {}
+
+
+class RoutingTable:
+    """
+    Compiled routing rules
+    """
+
+    def __init__(self, rules: list[RouteRule]):
+        self._root = _TrieNode()
+        for rule in rules:
+            self._add_rule(rule)
+
+    @classmethod
+    def compile(cls, rules: list[dict]) -> 'RoutingTable':
+        '''
+        Validates and compiles routing rules parsed from the
+        notification_routes parameter
+        '''
+        return cls([RouteRule.model_validate(rule) for rule in rules])
+
+    def _add_rule(self, rule: RouteRule):
+        mask = rule.level_mask()
+        categories = rule.categories if rule.categories is not None \
+            else [None]
+
+        for pattern in rule.collections:
+            node = self._root
+            previous = None
+            for char in pattern:
+                # Consecutive stars are equivalent to a single one
+                if char == '*' and previous == '*':
+                    continue
+                node = node.children.setdefault(char, _TrieNode())
+                previous = char
+
+            node.level_mask |= mask
+            for bit in LEVEL_BITS.values():
+                if not mask & bit:
+                    continue
+
+                by_category = node.recipients.setdefault(bit, {})
+                for category in categories:
+                    by_category.setdefault(category, set()) \
+                        .update(rule.recipients)
+
+    def resolve(self, message: EventMessage) -> frozenset[str]:
+        '''
+        Returns the recipients routed for a message
+        '''
+        bit = LEVEL_BITS[message.event_level]
+        recipients = set()
+
+        for node in self._match(message.collection_name, 0, self._root):
+            if not node.level_mask & bit:
+                continue
+
+            by_category = node.recipients[bit]
+            recipients.update(by_category.get(None, ()))
+            recipients.update(by_category.get(message.category, ()))
+
+        return frozenset(recipients)
+
+    def _match(self, name: str, index: int, node: _TrieNode):
+        '''
+        Yields the terminal nodes of all patterns matching name[index:]
+        '''
+        if index == len(name):
+            yield node
+
+        star = node.children.get('*')
+        if star is not None:
+            if not star.children:
+                # Trailing star; matches any remainder without backtracking
+                yield star
+            else:
+                for start in range(index, len(name) + 1):
+                    yield from self._match(name, start, star)
+
+        if index == len(name):
+            return
+
+        for key in (name[index], '?'):
+            child = node.children.get(key)
+            if child is not None:
+                yield from self._match(name, index + 1, child)
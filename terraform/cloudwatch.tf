@@ -26,3 +26,27 @@ resource "aws_lambda_permission" "allow_cloudwatch_to_call_daily_sigevent_event_
   principal = "events.amazonaws.com"
   source_arn = aws_cloudwatch_event_rule.every_24_hours[0].arn
 }
+
+// -- Notification Outbox Trigger
+resource "aws_cloudwatch_event_rule" "every_5_minutes" {
+  count = var.muted_mode ? 0 : 1
+  name = "${local.prefix}-every-5-minutes"
+  description = "Trigger rule every 5 minutes to drain the notification outbox"
+  schedule_expression = "rate(5 minutes)"
+}
+
+resource "aws_cloudwatch_event_target" "trigger_outbox_drain" {
+  count = var.muted_mode ? 0 : 1
+  rule = aws_cloudwatch_event_rule.every_5_minutes[0].name
+  target_id = "sigevent_outbox_drain_lambda"
+  arn = aws_lambda_function.outbox_drain[0].arn
+}
+
+resource "aws_lambda_permission" "allow_cloudwatch_to_call_outbox_drain_lambda" {
+  count = var.muted_mode ? 0 : 1
+  statement_id = "AllowExecutionFromCloudWatch"
+  action = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.outbox_drain[0].function_name
+  principal = "events.amazonaws.com"
+  source_arn = aws_cloudwatch_event_rule.every_5_minutes[0].arn
+}
@@ -14,3 +14,43 @@ resource "aws_dynamodb_table" "notification_count" {
     enabled = true
   }
 }
+
+resource "aws_dynamodb_table" "granule_index" {
+  name = "${local.prefix}-granule-index"
+  hash_key = "granule_name"
+  range_key = "event_key"
+
+  billing_mode = "PAY_PER_REQUEST"
+
+  attribute {
+    name = "granule_name"
+    type = "S"
+  }
+
+  attribute {
+    name = "event_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expiration"
+    enabled = true
+  }
+}
+
+resource "aws_dynamodb_table" "notification_outbox" {
+  name = "${local.prefix}-notification-outbox"
+  hash_key = "notification_id"
+
+  billing_mode = "PAY_PER_REQUEST"
+
+  attribute {
+    name = "notification_id"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expiration"
+    enabled = true
+  }
+}
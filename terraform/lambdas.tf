@@ -14,7 +14,43 @@ resource "aws_lambda_event_source_mapping" "sigevent_event_source_mapping" {
   event_source_arn = aws_sqs_queue.sigevent_input_queue.arn
   enabled          = true
   function_name    = aws_lambda_function.event_handler.function_name
-  batch_size       = 1  # TODO: add rejected message return to lambda
+  batch_size       = 1
+  function_response_types = ["ReportBatchItemFailures"]
+}
+
+resource "aws_lambda_event_source_mapping" "sigevent_low_priority_event_source_mapping" {
+  event_source_arn = aws_sqs_queue.sigevent_low_priority_queue.arn
+  enabled          = true
+  function_name    = aws_lambda_function.event_handler.function_name
+  batch_size       = var.low_priority_batch_size
+  function_response_types = ["ReportBatchItemFailures"]
+  maximum_batching_window_in_seconds = var.low_priority_batching_window
+
+  // Cap low priority concurrency so bulk traffic leaves headroom for the
+  // high priority lane
+  scaling_config {
+    maximum_concurrency = var.low_priority_max_concurrency
+  }
+}
+
+// Bulk ingestion of JSON arrays of events via direct invocation
+resource "aws_lambda_function" "bulk_event_handler" {
+  function_name     = "${local.prefix}-bulk-event-handler"
+  handler           = "podaac.sigevent.event_handler.invoke_direct"
+  role              = aws_iam_role.event_handler.arn
+  runtime           = "python3.11"
+  timeout           = 300
+
+  filename = "${path.module}/../dist/${local.name}-${local.version}.zip"
+  source_code_hash = filebase64sha256("${path.module}/../dist/${local.name}-${local.version}.zip")
+}
+
+resource "aws_lambda_permission" "allow_authorized_accounts_bulk_invoke" {
+  for_each = toset(var.authorized_accounts)
+  statement_id = "AllowBulkInvoke-${each.value}"
+  action = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.bulk_event_handler.function_name
+  principal = each.value
 }
 
 resource "aws_iam_role" "event_handler" {
@@ -41,7 +77,10 @@ resource "aws_iam_role" "event_handler" {
     policy = jsonencode({
       Version = "2012-10-17"
       Statement = [{
-        Resource = aws_sqs_queue.sigevent_input_queue.arn
+        Resource = [
+          aws_sqs_queue.sigevent_input_queue.arn,
+          aws_sqs_queue.sigevent_low_priority_queue.arn
+        ]
         Effect = "Allow"
         Action = [
           "sqs:ReceiveMessage",
@@ -63,6 +102,18 @@ resource "aws_iam_role" "event_handler" {
           "dynamodb:PutItem",
           "dynamodb:UpdateItem"
         ]
+      }, {
+        Effect = "Allow"
+        Resource = aws_dynamodb_table.granule_index.arn,
+        Action = [
+          "dynamodb:BatchWriteItem"
+        ]
+      }, {
+        Effect = "Allow"
+        Resource = aws_dynamodb_table.notification_outbox.arn,
+        Action = [
+          "dynamodb:PutItem"
+        ]
       }]
     })
   }
@@ -102,6 +153,43 @@ resource "aws_iam_role" "daily_report" {
   })
 }
 
+// -- Notification Outbox Drain
+resource "aws_lambda_function" "outbox_drain" {
+  count = var.muted_mode ? 0 : 1
+  function_name     = "${local.prefix}-outbox-drain"
+  handler           = "podaac.sigevent.outbox.invoke"
+  role              = aws_iam_role.outbox_drain[0].arn
+  runtime           = "python3.11"
+  timeout           = 60
+
+  // A single drainer prevents concurrent runs from sending twice
+  reserved_concurrent_executions = 1
+
+  filename = "${path.module}/../dist/${local.name}-${local.version}.zip"
+  source_code_hash = filebase64sha256("${path.module}/../dist/${local.name}-${local.version}.zip")
+}
+
+resource "aws_iam_role" "outbox_drain" {
+  count = var.muted_mode ? 0 : 1
+  name_prefix          = "outbox-drain"
+  path                 = "${local.service_path}/"
+  permissions_boundary = data.aws_iam_policy.permissions_boundary.arn
+
+  assume_role_policy   = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = "sts:AssumeRole"
+        Effect = "Allow"
+        Sid    = ""
+        Principal = {
+          Service = "lambda.amazonaws.com"
+        }
+      },
+    ]
+  })
+}
+
 // -- IAM Policy Attachments
 resource "aws_iam_role_policy_attachment" "event_handler-allow_ssm_access" {
   role = aws_iam_role.event_handler.name
@@ -136,6 +224,24 @@ resource "aws_iam_role_policy_attachment" "daily_report-allow_ses_send" {
   policy_arn = aws_iam_policy.allow_ses_send.arn
 }
 
+resource "aws_iam_role_policy_attachment" "outbox_drain-allow_ssm_access" {
+  count = var.muted_mode ? 0 : 1
+  role = aws_iam_role.outbox_drain[0].name
+  policy_arn = aws_iam_policy.allow_ssm_access.arn
+}
+
+resource "aws_iam_role_policy_attachment" "outbox_drain-allow_cloudwatch_logging" {
+  count = var.muted_mode ? 0 : 1
+  role = aws_iam_role.outbox_drain[0].name
+  policy_arn = aws_iam_policy.allow_cloudwatch_logging.arn
+}
+
+resource "aws_iam_role_policy_attachment" "outbox_drain-allow_ses_send" {
+  count = var.muted_mode ? 0 : 1
+  role = aws_iam_role.outbox_drain[0].name
+  policy_arn = aws_iam_policy.allow_ses_send.arn
+}
+
 // -- Role IAM Policies
 resource "aws_iam_role_policy" "daily_report" {
   count = var.muted_mode ? 0 : 1
@@ -147,7 +253,40 @@ resource "aws_iam_role_policy" "daily_report" {
     Statement = [{
       Effect = "Allow"
       Action = "logs:FilterLogEvents"
-      Resource = "${aws_cloudwatch_log_group.sigevent.arn}:log-stream:*"
+      Resource = concat(
+        ["${aws_cloudwatch_log_group.sigevent.arn}:log-stream:*"],
+        [
+          for source in var.report_sources : startswith(source.log_group, "arn:")
+            ? "${trimsuffix(source.log_group, ":*")}:log-stream:*"
+            : "arn:aws:logs:${var.region}:${data.aws_caller_identity.current.account_id}:log-group:${source.log_group}:log-stream:*"
+        ]
+      )
+    }, {
+      Effect = "Allow"
+      Action = [
+        "s3:GetObject",
+        "s3:PutObject"
+      ]
+      Resource = "${aws_s3_bucket.reports[0].arn}/reports/*"
+    }]
+  })
+}
+
+resource "aws_iam_role_policy" "outbox_drain" {
+  count = var.muted_mode ? 0 : 1
+  name_prefix = "OutboxDrainPolicy"
+  role = aws_iam_role.outbox_drain[0].name
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect = "Allow"
+      Resource = aws_dynamodb_table.notification_outbox.arn
+      Action = [
+        "dynamodb:Scan",
+        "dynamodb:UpdateItem",
+        "dynamodb:DeleteItem"
+      ]
     }]
   })
 }
@@ -247,12 +386,26 @@ resource "aws_ssm_parameter" "notification_emails" {
   type = "String"
 }
 
+resource "aws_ssm_parameter" "notification_routes" {
+  count = var.notification_routes == null ? 0 : 1
+  name = "${local.service_path}/notification_routes"
+  value = jsonencode(var.notification_routes)
+  type = "String"
+}
+
 resource "aws_ssm_parameter" "log_group" {
   name = "${local.service_path}/log_group"
   value = aws_cloudwatch_log_group.sigevent.name
   type = "String"
 }
 
+resource "aws_ssm_parameter" "report_sources" {
+  count = length(var.report_sources) > 0 ? 1 : 0
+  name = "${local.service_path}/report_sources"
+  value = jsonencode(var.report_sources)
+  type = "String"
+}
+
 resource "aws_ssm_parameter" "log_level" {
   name = "${local.service_path}/log_level"
   value = var.log_level
@@ -265,6 +418,24 @@ resource "aws_ssm_parameter" "notification_table_name" {
   type = "String"
 }
 
+resource "aws_ssm_parameter" "granule_index_table_name" {
+  name = "${local.service_path}/granule_index_table_name"
+  value = aws_dynamodb_table.granule_index.name
+  type = "String"
+}
+
+resource "aws_ssm_parameter" "granule_index_ttl_days" {
+  name = "${local.service_path}/granule_index_ttl_days"
+  value = tostring(var.granule_index_ttl_days)
+  type = "String"
+}
+
+resource "aws_ssm_parameter" "outbox_table_name" {
+  name = "${local.service_path}/outbox_table_name"
+  value = aws_dynamodb_table.notification_outbox.name
+  type = "String"
+}
+
 resource "aws_ssm_parameter" "stage" {
   name = "${local.service_path}/stage"
   value = upper(var.environment)
@@ -282,3 +453,15 @@ resource "aws_ssm_parameter" "muted_mode" {
   value = tostring(var.muted_mode)
   type = "String"
 }
+
+resource "aws_ssm_parameter" "profiling_enabled" {
+  name = "${local.service_path}/profiling_enabled"
+  value = tostring(var.profiling_enabled)
+  type = "String"
+}
+
+resource "aws_ssm_parameter" "rollup_mode" {
+  name = "${local.service_path}/rollup_mode"
+  value = tostring(var.rollup_mode)
+  type = "String"
+}
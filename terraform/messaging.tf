@@ -4,10 +4,35 @@ resource "aws_sns_topic" "sigevent_input_topic" {
   name = "${var.service_name}-${var.environment}-input-topic"
 }
 
+// ERROR/WARN events are routed to the high priority input queue; DEBUG/INFO
+// events to the low priority queue so bulk traffic cannot delay notifications
 resource "aws_sns_topic_subscription" "sigevent_subscription" {
   topic_arn = aws_sns_topic.sigevent_input_topic.arn
   protocol  = "sqs"
   endpoint  = aws_sqs_queue.sigevent_input_queue.arn
+
+  filter_policy_scope = "MessageBody"
+  filter_policy = jsonencode({
+    event_level = ["ERROR", "WARN"]
+  })
+}
+
+resource "aws_sns_topic_subscription" "sigevent_low_priority_subscription" {
+  topic_arn = aws_sns_topic.sigevent_input_topic.arn
+  protocol  = "sqs"
+  endpoint  = aws_sqs_queue.sigevent_low_priority_queue.arn
+
+  filter_policy_scope = "MessageBody"
+  // Messages without an event_level still reach the handler so they are
+  // logged as validation failures rather than silently dropped by SNS.
+  // Bodies which are not JSON cannot match a body-scoped policy at all;
+  // emitters must publish JSON as required by the EventMessage schema.
+  filter_policy = jsonencode({
+    event_level = [
+      { "anything-but" = ["ERROR", "WARN"] },
+      { "exists" = false }
+    ]
+  })
 }
 
 resource "aws_sns_topic_policy" "input_topic_policy" {
@@ -45,6 +70,15 @@ resource "aws_sqs_queue" "sigevent_input_queue" {
   })
 }
 
+resource "aws_sqs_queue" "sigevent_low_priority_queue" {
+  name = "${local.prefix}-low-priority-queue"
+  visibility_timeout_seconds = 120
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.sigevent_dlq.arn
+    maxReceiveCount     = 3
+  })
+}
+
 resource "aws_sqs_queue" "sigevent_dlq" {
   name = "${local.prefix}-dlq"
 }
@@ -57,7 +91,10 @@ data "aws_iam_policy_document" "sigevent_sns_to_sqs_policy_doc" {
       identifiers = ["sns.amazonaws.com"]
     }
     actions   = ["sqs:SendMessage"]
-    resources = [aws_sqs_queue.sigevent_input_queue.arn]
+    resources = [
+      aws_sqs_queue.sigevent_input_queue.arn,
+      aws_sqs_queue.sigevent_low_priority_queue.arn
+    ]
 
     condition {
       test     = "ArnEquals"
@@ -71,3 +108,8 @@ resource "aws_sqs_queue_policy" "sigevent_sns_to_sqs_policy" {
   queue_url = aws_sqs_queue.sigevent_input_queue.url
   policy    = data.aws_iam_policy_document.sigevent_sns_to_sqs_policy_doc.json
 }
+
+resource "aws_sqs_queue_policy" "sigevent_sns_to_low_priority_sqs_policy" {
+  queue_url = aws_sqs_queue.sigevent_low_priority_queue.url
+  policy    = data.aws_iam_policy_document.sigevent_sns_to_sqs_policy_doc.json
+}
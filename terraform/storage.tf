@@ -0,0 +1,30 @@
+// -- Rendered Daily Reports
+resource "aws_s3_bucket" "reports" {
+  count = var.muted_mode ? 0 : 1
+  bucket_prefix = "${local.prefix}-reports"
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "reports" {
+  count = var.muted_mode ? 0 : 1
+  bucket = aws_s3_bucket.reports[0].id
+
+  rule {
+    id = "expire-reports"
+    status = "Enabled"
+
+    filter {
+      prefix = "reports/"
+    }
+
+    expiration {
+      days = var.report_retention_days
+    }
+  }
+}
+
+resource "aws_ssm_parameter" "report_bucket" {
+  count = var.muted_mode ? 0 : 1
+  name = "${local.service_path}/report_bucket"
+  value = aws_s3_bucket.reports[0].bucket
+  type = "String"
+}
@@ -28,6 +28,17 @@ variable "notification_emails" {
   type = list(string)
 }
 
+variable "notification_routes" {
+  type = list(object({
+    collections = optional(list(string), ["*"])
+    categories  = optional(list(string))
+    min_level   = optional(string, "DEBUG")
+    recipients  = list(string)
+  }))
+  default = null
+  description = "Routes notifications by collection glob, category and minimum level; notification_emails receive everything when unset"
+}
+
 variable "authorized_accounts" {
   type = list(string)
   default = []
@@ -44,8 +55,59 @@ variable "muted_mode" {
   description = "Disables sending of notifications; useful for SIT/UAT"
 }
 
+variable "profiling_enabled" {
+  type = bool
+  default = false
+  description = "Profiles lambda invocations with cProfile/tracemalloc and logs the hotspots"
+}
+
+variable "rollup_mode" {
+  type = bool
+  default = false
+  description = "Collapses similar DEBUG/INFO events of a batch into a single summary log record"
+}
+
 variable "max_daily_warns" {
   type = number
   default = 3
   description = "Max number of WARN notifications to send per collection, per day"
 }
+
+variable "granule_index_ttl_days" {
+  type = number
+  default = 30
+  description = "Number of days granule event index entries are retained"
+}
+
+variable "low_priority_batch_size" {
+  type = number
+  default = 10
+  description = "SQS batch size for the DEBUG/INFO event lane"
+}
+
+variable "low_priority_batching_window" {
+  type = number
+  default = 5
+  description = "Seconds to gather DEBUG/INFO events before invoking the event handler"
+}
+
+variable "low_priority_max_concurrency" {
+  type = number
+  default = 2
+  description = "Max concurrent event handler invocations for the DEBUG/INFO event lane"
+}
+
+variable "report_sources" {
+  type = list(object({
+    name      = string
+    log_group = string
+  }))
+  default = []
+  description = "Log groups (names or ARNs) scanned by the daily report; defaults to this stage's log group"
+}
+
+variable "report_retention_days" {
+  type = number
+  default = 30
+  description = "Number of days rendered daily reports are kept for resends"
+}
@@ -0,0 +1,253 @@
+import json
+from os import environ
+import queue
+import threading
+from unittest.mock import MagicMock, patch
+
+import boto3
+from botocore.exceptions import ClientError, NoCredentialsError
+import moto
+from pytest import fixture, raises
+
+from podaac.sigevent.client import SigeventClient
+from podaac.sigevent.message import EventLevel, EventMessage
+
+
+@fixture
+def fields():
+    return {
+        'collection_name': 'collection-name',
+        'category': 'category',
+        'subject': 'subject',
+        'description': 'description',
+        'source_name': 'source-name',
+        'executor': 'executor',
+        'event_level': EventLevel.INFO
+    }
+
+
+@fixture(autouse=True)
+def no_retry_delay():
+    with patch('podaac.sigevent.client.PUBLISH_RETRY_DELAY', 0):
+        yield
+
+
+@fixture
+def mock_sns():
+    sns = MagicMock()
+    sns.publish_batch.return_value = {'Successful': [], 'Failed': []}
+    return sns
+
+
+def published_messages(mock_sns):
+    return [
+        entry['Message']
+        for call in mock_sns.publish_batch.call_args_list
+        for entry in call.kwargs['PublishBatchRequestEntries']
+    ]
+
+
+def test_emit_batches(mock_sns, fields):
+    with SigeventClient('topic-arn', mock_sns, flush_interval=60) as client:
+        for _ in range(100):
+            client.emit(**fields)
+
+    assert mock_sns.publish_batch.call_count == 10
+    assert client.publish_calls == 10
+    assert len(published_messages(mock_sns)) == 100
+    assert mock_sns.publish_batch.call_args.kwargs['TopicArn'] == 'topic-arn'
+
+
+def test_emit_validates(mock_sns, fields):
+    client = SigeventClient('topic-arn', mock_sns)
+    del fields['subject']
+
+    with raises(ValueError):
+        client.emit(fields)
+
+    client.close()
+    mock_sns.publish_batch.assert_not_called()
+
+
+def test_emit_stamps_timestamp(mock_sns, fields):
+    client = SigeventClient('topic-arn', mock_sns)
+    client.emit(EventMessage(**fields))
+    client.flush()
+
+    message = EventMessage.model_validate_json(published_messages(mock_sns)[0])
+    assert message.timestamp is not None
+    client.close()
+
+
+def test_emit_size_aware(mock_sns, fields):
+    fields['description'] = 'x' * 100 * 1024
+
+    with SigeventClient('topic-arn', mock_sns, flush_interval=60) as client:
+        for _ in range(5):
+            client.emit(**fields)
+
+    batch_sizes = [
+        len(call.kwargs['PublishBatchRequestEntries'])
+        for call in mock_sns.publish_batch.call_args_list
+    ]
+    assert batch_sizes == [2, 2, 1]
+
+
+def test_emit_oversized(mock_sns, fields):
+    fields['description'] = 'x' * 256 * 1024
+
+    with SigeventClient('topic-arn', mock_sns) as client:
+        with raises(ValueError):
+            client.emit(**fields)
+
+
+def test_flush_interval(mock_sns, fields):
+    client = SigeventClient('topic-arn', mock_sns, flush_interval=0.01)
+    published = threading.Event()
+    mock_sns.publish_batch.side_effect = lambda **_: published.set() or {}
+
+    client.emit(**fields)
+
+    assert published.wait(5)
+    client.close()
+
+
+def test_emit_backpressure(mock_sns, fields):
+    publishing = threading.Event()
+    release = threading.Event()
+
+    def publish_batch(**_):
+        publishing.set()
+        release.wait(5)
+        return {}
+
+    mock_sns.publish_batch.side_effect = publish_batch
+    client = SigeventClient(
+        'topic-arn', mock_sns, max_queue_size=1, flush_interval=0.01)
+
+    client.emit(**fields)
+    assert publishing.wait(5)
+    client.emit(**fields)
+
+    with raises(queue.Full):
+        client.emit(block=False, **fields)
+
+    release.set()
+    client.close()
+    assert mock_sns.publish_batch.call_count == 2
+
+
+def test_publish_failures(mock_sns, fields):
+    mock_sns.publish_batch.return_value = {
+        'Successful': [],
+        'Failed': [{'Id': '0', 'Code': 'InternalError', 'SenderFault': False}]
+    }
+
+    with SigeventClient('topic-arn', mock_sns) as client:
+        client.emit(**fields)
+
+    assert client.failed_count == 1
+    assert mock_sns.publish_batch.call_count == 3
+
+
+def test_publish_retries_entries(mock_sns, fields):
+    mock_sns.publish_batch.side_effect = [
+        {
+            'Successful': [{'Id': '0'}],
+            'Failed': [
+                {'Id': '1', 'Code': 'InternalError', 'SenderFault': False},
+                {'Id': '2', 'Code': 'InvalidParameter', 'SenderFault': True}
+            ]
+        },
+        {'Successful': [{'Id': '1'}], 'Failed': []}
+    ]
+
+    with SigeventClient('topic-arn', mock_sns, flush_interval=60) as client:
+        for _ in range(3):
+            client.emit(**fields)
+
+    assert client.failed_count == 1
+    assert client.publish_calls == 2
+    retried = mock_sns.publish_batch.call_args.kwargs['PublishBatchRequestEntries']
+    assert [entry['Id'] for entry in retried] == ['1']
+
+
+def test_publish_retries_throttling(mock_sns, fields):
+    mock_sns.publish_batch.side_effect = [
+        ClientError({'Error': {'Code': 'Throttling'}}, 'PublishBatch'),
+        {'Successful': [{'Id': '0'}], 'Failed': []}
+    ]
+
+    with SigeventClient('topic-arn', mock_sns) as client:
+        client.emit(**fields)
+
+    assert client.failed_count == 0
+    assert mock_sns.publish_batch.call_count == 2
+
+
+def test_publish_permanent_error(mock_sns, fields):
+    mock_sns.publish_batch.side_effect = NoCredentialsError()
+
+    with SigeventClient('topic-arn', mock_sns) as client:
+        client.emit(**fields)
+
+    assert client.failed_count == 1
+    mock_sns.publish_batch.assert_called_once()
+
+
+def test_publish_survives_unexpected_errors(mock_sns, fields):
+    mock_sns.publish_batch.side_effect = [
+        KeyError('Failed'),
+        {'Successful': [{'Id': '0'}], 'Failed': []}
+    ]
+    client = SigeventClient('topic-arn', mock_sns)
+
+    client.emit(**fields)
+    assert client.flush(5)
+    client.emit(**fields)
+    assert client.flush(5)
+
+    assert client.failed_count == 1
+    assert mock_sns.publish_batch.call_count == 2
+    client.close()
+
+
+@moto.mock_sns
+@moto.mock_sqs
+@patch.dict(environ, {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_DEFAULT_REGION': 'us-west-2'
+})
+def test_emit_moto(fields):
+    sns = boto3.client('sns', region_name='us-west-2')
+    sqs = boto3.client('sqs', region_name='us-west-2')
+    topic_arn = sns.create_topic(Name='sigevent-input')['TopicArn']
+    queue_url = sqs.create_queue(QueueName='sigevent-input')['QueueUrl']
+    queue_arn = sqs.get_queue_attributes(
+        QueueUrl=queue_url, AttributeNames=['QueueArn']
+    )['Attributes']['QueueArn']
+    sns.subscribe(
+        TopicArn=topic_arn,
+        Protocol='sqs',
+        Endpoint=queue_arn,
+        Attributes={'RawMessageDelivery': 'true'}
+    )
+
+    with SigeventClient(topic_arn, sns, flush_interval=60) as client:
+        for index in range(25):
+            client.emit(**{**fields, 'subject': f'subject-{index}'})
+
+    received = []
+    while True:
+        messages = sqs.receive_message(
+            QueueUrl=queue_url, MaxNumberOfMessages=10
+        ).get('Messages', [])
+        if not messages:
+            break
+        received.extend(messages)
+
+    assert client.publish_calls == 3
+    assert client.failed_count == 0
+    subjects = {json.loads(message['Body'])['subject'] for message in received}
+    assert subjects == {f'subject-{index}' for index in range(25)}
@@ -1,11 +1,12 @@
 from datetime import datetime, timezone
 import json
 from os import environ
+from tempfile import mkdtemp
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import pytest
 
-from podaac.sigevent.message import EventLevel, EventMessage
+from podaac.sigevent.message import EventLevel, EventMessage, RollupMessage
 
 with (
     patch('boto3.client'),
@@ -21,6 +22,11 @@ class TestDailyReportGen(TestCase):
         daily_report_gen.cloudwatchlogs.reset_mock(return_value=True, side_effect=True)
         daily_report_gen.ses.reset_mock(return_value=True, side_effect=True)
 
+        cache_patch = patch(
+            'podaac.sigevent.daily_report_gen.REPORT_CACHE_DIR', mkdtemp())
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
     @patch('podaac.sigevent.daily_report_gen.datetime')
     @patch('podaac.sigevent.daily_report_gen.cloudwatchlogs')
     @patch('podaac.sigevent.daily_report_gen.CLOUDWATCH_LOG_GROUP', 'test-cw-group')
@@ -89,6 +95,53 @@ class TestDailyReportGen(TestCase):
             }
         }])
 
+    def test_analyze_messages_rollup(self):
+        message = EventMessage(
+            collection_name='collection-name',
+            category='category',
+            subject='subject',
+            description='description',
+            source_name='source-name',
+            executor='executor',
+            event_level=EventLevel.INFO
+        )
+        rollup = RollupMessage(
+            **message.model_dump(),
+            event_count=41,
+            first_timestamp=datetime(1990, 1, 1, tzinfo=timezone.utc),
+            last_timestamp=datetime(1990, 1, 1, 1, tzinfo=timezone.utc)
+        )
+
+        results = daily_report_gen.analyze_messages([message, rollup])
+
+        self.assertEqual(results[0]['level_counts'][EventLevel.INFO], 42)
+        self.assertEqual(results[0]['category_counts'], {'category': 42})
+
+    @patch('podaac.sigevent.daily_report_gen.cloudwatchlogs')
+    def test_search_error_logs_rollup(self, mock_cloudwatch):
+        mock_cloudwatch.filter_log_events.return_value = {
+            'events': [{
+                'message': json.dumps({
+                    'collection_name': 'collection-name',
+                    'category': 'category',
+                    'subject': 'subject',
+                    'description': 'description',
+                    'event_level': EventLevel.DEBUG,
+                    'source_name': 'source-name',
+                    'executor': 'executor',
+                    'event_count': 3,
+                    'first_timestamp': '1990-01-01T00:00:00Z',
+                    'last_timestamp': '1990-01-01T01:00:00Z',
+                    'sample_granules': ['granule-name']
+                })
+            }]
+        }
+
+        results = daily_report_gen.search_error_logs()
+
+        self.assertIsInstance(results[0], RollupMessage)
+        self.assertEqual(results[0].event_count, 3)
+
     @patch('podaac.sigevent.daily_report_gen.NOTIFICATION_EMAILS', [
         'joshua.a.garde@jpl.nasa.gov',
         'podaac-ia@jpl.nasa.gov'
@@ -110,3 +163,172 @@ class TestDailyReportGen(TestCase):
 
         daily_report_gen.invoke(None, None)
         self.assertEqual(daily_report_gen.ses.send_email.call_count, 2)
+
+    @patch('podaac.sigevent.daily_report_gen.REPORT_SOURCES', None)
+    @patch('podaac.sigevent.daily_report_gen.STAGE', 'OPS')
+    @patch('podaac.sigevent.daily_report_gen.CLOUDWATCH_LOG_GROUP', 'test-cw-group')
+    def test_resolve_sources(self):
+        self.assertEqual(
+            daily_report_gen.resolve_sources(None),
+            [{'name': 'OPS', 'log_group': 'test-cw-group'}]
+        )
+        self.assertEqual(
+            daily_report_gen.resolve_sources({'sources': [
+                'sit-group', {'name': 'uat', 'log_group': 'uat-group'}
+            ]}),
+            [
+                {'name': 'sit-group', 'log_group': 'sit-group'},
+                {'name': 'uat', 'log_group': 'uat-group'}
+            ]
+        )
+
+    @patch('podaac.sigevent.daily_report_gen.cloudwatchlogs')
+    def test_scan_sources(self, mock_cloudwatch):
+        def filter_log_events(**kwargs):
+            level = EventLevel.ERROR if 'logGroupIdentifier' in kwargs \
+                else EventLevel.INFO
+            return {'events': [{
+                'message': EventMessage(
+                    collection_name='collection-name',
+                    category='category',
+                    subject='subject',
+                    description='description',
+                    source_name='source-name',
+                    executor='executor',
+                    event_level=level
+                ).model_dump_json()
+            }]}
+
+        mock_cloudwatch.filter_log_events.side_effect = filter_log_events
+
+        source_reports = daily_report_gen.scan_sources([
+            {'name': 'sit', 'log_group': 'sit-group'},
+            {'name': 'ops', 'log_group': 'arn:aws:logs:us-west-2:0:log-group:ops'}
+        ])
+        analyses = daily_report_gen.merge_source_reports(source_reports)
+
+        self.assertEqual(
+            [report['name'] for report in source_reports], ['sit', 'ops']
+        )
+        self.assertEqual(source_reports[1]['level_counts'][EventLevel.ERROR], 1)
+        self.assertFalse(source_reports[0]['partial'])
+        self.assertEqual(
+            [analysis['source'] for analysis in analyses], ['ops', 'sit']
+        )
+
+        csv_file = daily_report_gen.generate_csv_report(analyses, multi_source=True)
+        self.assertTrue(csv_file.readline().startswith('Source,Collection Name'))
+
+        html_report = daily_report_gen.generate_html_report(analyses, source_reports)
+        self.assertIn('<th>Source</th>', html_report)
+
+    @patch('podaac.sigevent.daily_report_gen.cloudwatchlogs')
+    def test_scan_sources_streams_pages(self, mock_cloudwatch):
+        event = {'message': EventMessage(
+            collection_name='collection-name',
+            category='category',
+            subject='subject',
+            description='description',
+            source_name='source-name',
+            executor='executor',
+            event_level=EventLevel.ERROR
+        ).model_dump_json()}
+        mock_cloudwatch.filter_log_events.side_effect = [
+            {'events': [event, event], 'nextToken': 'token'},
+            {'events': [event]}
+        ]
+        analyze_messages = daily_report_gen.analyze_messages
+
+        with patch(
+            'podaac.sigevent.daily_report_gen.analyze_messages',
+            side_effect=analyze_messages
+        ) as mock_analyze:
+            source_reports = daily_report_gen.scan_sources(
+                [{'name': 'sit', 'log_group': 'sit-group'}])
+
+        # Messages are streamed into the analysis instead of collected first
+        self.assertNotIsInstance(mock_analyze.call_args.args[0], list)
+        self.assertEqual(
+            source_reports[0]['analyses'][0]['level_counts'][EventLevel.ERROR], 3
+        )
+
+    @patch('podaac.sigevent.daily_report_gen.cloudwatchlogs')
+    def test_search_error_logs_deadline(self, mock_cloudwatch):
+        mock_cloudwatch.filter_log_events.return_value = {
+            'events': [], 'nextToken': 'token'
+        }
+
+        daily_report_gen.search_error_logs('test-cw-group', deadline=0)
+
+        mock_cloudwatch.filter_log_events.assert_called_once()
+
+    @patch('podaac.sigevent.daily_report_gen.NOTIFICATION_EMAILS', [
+        'podaac-ia@jpl.nasa.gov'
+    ])
+    @patch('podaac.sigevent.daily_report_gen.iter_error_logs')
+    def test_invoke_multi_source(self, mock_search):
+        mock_search.return_value = []
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 60000
+
+        daily_report_gen.invoke({'sources': ['sit-group', 'uat-group']}, context)
+
+        self.assertEqual(
+            sorted(call.args[0] for call in mock_search.call_args_list),
+            ['sit-group', 'uat-group']
+        )
+        self.assertEqual(daily_report_gen.ses.send_email.call_count, 1)
+
+    @patch('podaac.sigevent.daily_report_gen.NOTIFICATION_EMAILS', [
+        'podaac-ia@jpl.nasa.gov'
+    ])
+    @patch('podaac.sigevent.daily_report_gen.iter_error_logs')
+    def test_invoke_resend(self, mock_search):
+        mock_search.return_value = []
+
+        daily_report_gen.invoke(None, None)
+        daily_report_gen.invoke({'resend': True}, None)
+
+        mock_search.assert_called_once()
+        calls = daily_report_gen.ses.send_email.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            calls[0].kwargs['Content'], calls[1].kwargs['Content']
+        )
+
+    @patch('podaac.sigevent.daily_report_gen.REPORT_BUCKET', 'report-bucket')
+    @patch('podaac.sigevent.daily_report_gen.s3')
+    def test_load_report_artifact_s3(self, mock_s3):
+        mock_s3.get_object.return_value['Body'].read.return_value = b'report'
+
+        self.assertEqual(
+            daily_report_gen.load_report_artifact('1990-01-01'), b'report'
+        )
+        mock_s3.get_object.assert_called_once_with(
+            Bucket='report-bucket', Key='reports/1990-01-01.eml'
+        )
+
+    def test_invoke_resend_missing(self):
+        daily_report_gen.invoke({'resend': '1990-01-01'}, None)
+
+        daily_report_gen.ses.send_email.assert_not_called()
+
+    @patch('podaac.sigevent.daily_report_gen.load_report_artifact')
+    def test_invoke_resend_invalid_date(self, mock_load):
+        daily_report_gen.invoke({'resend': '../../etc/passwd'}, None)
+
+        mock_load.assert_not_called()
+        daily_report_gen.ses.send_email.assert_not_called()
+
+    @patch('podaac.sigevent.daily_report_gen.NOTIFICATION_EMAILS', [
+        'podaac-ia@jpl.nasa.gov'
+    ])
+    @patch('podaac.sigevent.daily_report_gen.store_report_artifact')
+    @patch('podaac.sigevent.daily_report_gen.iter_error_logs')
+    def test_invoke_store_failure(self, mock_search, mock_store):
+        mock_search.return_value = []
+        mock_store.side_effect = OSError('No space left on device')
+
+        daily_report_gen.invoke(None, None)
+
+        daily_report_gen.ses.send_email.assert_called_once()
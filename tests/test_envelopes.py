@@ -0,0 +1,114 @@
+import base64
+from datetime import datetime, timezone
+import json
+
+from pytest import fixture, raises
+
+from podaac.sigevent import envelopes
+
+
+@fixture
+def message():
+    return {
+        'collection_name': 'collection-name',
+        'category': 'category',
+        'subject': 'subject',
+        'description': 'description',
+        'event_level': 'ERROR',
+        'source_name': 'source-name',
+        'executor': 'executor'
+    }
+
+
+def test_unwrap_sqs(message):
+    event = {'Records': [{
+        'body': json.dumps({
+            'Message': json.dumps(message),
+            'Timestamp': '1970-01-01T00:00:00.000Z'
+        })
+    }]}
+
+    raw_events = list(envelopes.unwrap(event, 'sqs'))
+
+    assert raw_events == [envelopes.RawEvent(
+        json.dumps(message), datetime(1970, 1, 1, tzinfo=timezone.utc)
+    )]
+
+
+def test_unwrap_sns(message):
+    event = {'Records': [{
+        'Sns': {
+            'Message': json.dumps(message),
+            'Timestamp': '1970-01-01T00:00:00.000Z'
+        }
+    }]}
+
+    raw_events = list(envelopes.unwrap(event, 'sns'))
+
+    assert json.loads(raw_events[0].message) == message
+    assert raw_events[0].timestamp == datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def test_unwrap_kinesis(message):
+    def kinesis_record(data):
+        return {'kinesis': {
+            'data': base64.b64encode(json.dumps(data).encode()).decode(),
+            'approximateArrivalTimestamp': 0.0
+        }}
+
+    event = {'Records': [
+        kinesis_record(message),
+        kinesis_record([message, message])
+    ]}
+
+    raw_events = list(envelopes.unwrap(event, 'kinesis'))
+
+    assert len(raw_events) == 3
+    assert all(json.loads(raw.message) == message for raw in raw_events)
+    assert raw_events[0].timestamp == datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def test_unwrap_kinesis_malformed(message):
+    event = {'Records': [
+        {'kinesis': {
+            'data': base64.b64encode(b'[{"subject": ').decode(),
+            'approximateArrivalTimestamp': 0.0,
+            'sequenceNumber': '1'
+        }},
+        {'kinesis': {
+            'data': base64.b64encode(json.dumps(message).encode()).decode(),
+            'approximateArrivalTimestamp': 0.0,
+            'sequenceNumber': '2'
+        }}
+    ]}
+
+    raw_events = list(envelopes.unwrap(event, 'kinesis'))
+
+    assert raw_events[0] == envelopes.RawEvent(None, None, '1')
+    assert json.loads(raw_events[1].message) == message
+
+
+def test_unwrap_eventbridge(message):
+    event = {
+        'detail-type': 'Sigevent',
+        'detail': message,
+        'time': '1970-01-01T00:00:00Z'
+    }
+
+    raw_events = list(envelopes.unwrap(event, 'eventbridge'))
+
+    assert json.loads(raw_events[0].message) == message
+    assert raw_events[0].timestamp == datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def test_unwrap_direct(message):
+    assert len(list(envelopes.unwrap([message, message], 'direct'))) == 2
+    assert len(list(envelopes.unwrap({'messages': [message]}, 'direct'))) == 1
+
+    with raises(ValueError):
+        list(envelopes.unwrap(message, 'direct'))
+
+
+def test_unwrap_unknown():
+    with raises(ValueError):
+        envelopes.unwrap({}, 'carrier-pigeon')
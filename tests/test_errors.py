@@ -0,0 +1,22 @@
+from botocore.exceptions import (
+    ClientError, EndpointConnectionError, NoCredentialsError,
+    ParamValidationError, ReadTimeoutError
+)
+
+from podaac.sigevent.errors import is_transient
+
+
+def test_is_transient():
+    assert is_transient(
+        ClientError({'Error': {'Code': 'Throttling'}}, 'SendEmail')
+    )
+    assert is_transient(
+        ClientError({'Error': {'Code': 'KMSThrottling'}}, 'PublishBatch')
+    )
+    assert is_transient(EndpointConnectionError(endpoint_url='url'))
+    assert is_transient(ReadTimeoutError(endpoint_url='url'))
+    assert not is_transient(
+        ClientError({'Error': {'Code': 'MessageRejected'}}, 'SendEmail')
+    )
+    assert not is_transient(ParamValidationError(report='report'))
+    assert not is_transient(NoCredentialsError())
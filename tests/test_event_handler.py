@@ -1,11 +1,17 @@
+import base64
 from datetime import datetime, timezone
+import json
 from os import environ
+import time
 from unittest import TestCase
 from unittest.mock import patch
 
-from pytest import fixture
+from botocore.exceptions import ClientError
+from pytest import fixture, raises
 
-from podaac.sigevent.message import EventLevel, EventMessage
+from podaac.sigevent.message import EventLevel, EventMessage, RollupMessage
+from podaac.sigevent.rendering import RenderedNotification
+from podaac.sigevent.routing import RoutingTable
 
 with (
     patch('boto3.client'),
@@ -115,8 +121,8 @@ def test_send_notification():
 
     emails = ('joshua.a.garde@jpl.nasa.gov', 'podaac-ia@jpl.nasa.gov')
 
-    assert event_handler.ses.send_email.call_count == 2
-    for call in event_handler.ses.send_email.call_args_list:
+    assert event_handler.outbox.ses.send_email.call_count == 2
+    for call in event_handler.outbox.ses.send_email.call_args_list:
         kwargs = call.kwargs
         assert kwargs['Destination']['ToAddresses'][0] in emails
 
@@ -200,3 +206,326 @@ def test_process_event_message_always_send(mock_increment, mock_send, mock_count
     )
     mock_send.assert_called_with(event_message)
     mock_increment.assert_not_called()
+
+
+def sqs_record(message: EventMessage, message_id: str = None):
+    return {
+        'messageId': message_id,
+        'body': json.dumps({
+            'Message': message.model_dump_json(),
+            'Timestamp': '1970-01-01T00:00:00+00:00'
+        })
+    }
+
+
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_prioritizes_levels(mock_process, event_message):
+    levels = [EventLevel.DEBUG, EventLevel.WARN, EventLevel.INFO, EventLevel.ERROR]
+    records = [
+        sqs_record(event_message.model_copy(update={
+            'event_level': level, 'subject': str(index)
+        }))
+        for index, level in enumerate(levels * 2)
+    ]
+
+    event_handler.invoke({'Records': records}, None)
+
+    processed = [call.args[0] for call in mock_process.call_args_list]
+    assert [message.event_level for message in processed] == [
+        EventLevel.ERROR, EventLevel.ERROR,
+        EventLevel.WARN, EventLevel.WARN,
+        EventLevel.INFO, EventLevel.INFO,
+        EventLevel.DEBUG, EventLevel.DEBUG
+    ]
+    # Arrival order is preserved within a level
+    assert [message.subject for message in processed[:2]] == ['3', '7']
+
+
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_error_latency_under_flood(mock_process, event_message):
+    # Each event costs 2 ms to process, so an ERROR queued behind a flood of
+    # 200 DEBUG events would wait at least 400 ms in arrival order
+    event_cost = 0.002
+    flood = [
+        sqs_record(event_message.model_copy(update={
+            'event_level': EventLevel.DEBUG
+        }))
+        for _ in range(200)
+    ]
+    error = sqs_record(event_message.model_copy(update={
+        'event_level': EventLevel.ERROR
+    }))
+    error_processed = []
+
+    def process(message, **_):
+        time.sleep(event_cost)
+        if message.event_level is EventLevel.ERROR:
+            error_processed.append(time.perf_counter())
+
+    mock_process.side_effect = process
+
+    start = time.perf_counter()
+    event_handler.invoke({'Records': flood + [error]}, None)
+
+    assert mock_process.call_count == 201
+    assert error_processed[0] - start < 50 * event_cost
+
+
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_uses_sns_timestamp(mock_process, event_message):
+    record = sqs_record(event_message.model_copy(update={'timestamp': None}))
+
+    event_handler.invoke({'Records': [record]}, None)
+
+    assert mock_process.call_args.args[0].timestamp == \
+        datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def test_rollup_messages(event_message):
+    messages = [
+        event_message.model_copy(update={
+            'granule_name': f'granule-{index}',
+            'timestamp': datetime(1970, 1, 1, 0, index, tzinfo=timezone.utc)
+        })
+        for index in range(8)
+    ]
+    error = event_message.model_copy(update={'event_level': EventLevel.ERROR})
+    lone_info = event_message.model_copy(update={
+        'event_level': EventLevel.INFO
+    })
+
+    results = event_handler.rollup_messages(messages + [error, lone_info])
+
+    assert len(results) == 3
+    assert error in results
+    assert lone_info in results
+
+    rollup = next(
+        message for message in results
+        if isinstance(message, RollupMessage)
+    )
+    assert rollup.event_count == 8
+    assert rollup.event_level is EventLevel.DEBUG
+    assert rollup.first_timestamp == datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert rollup.last_timestamp == \
+        datetime(1970, 1, 1, 0, 7, tzinfo=timezone.utc)
+    assert rollup.sample_granules == tuple(f'granule-{index}' for index in range(5))
+    assert rollup.granule_name is None
+
+
+@patch('podaac.sigevent.event_handler.ROLLUP_MODE', True)
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_rollup_mode(mock_process, event_message):
+    records = [sqs_record(event_message) for _ in range(3)]
+
+    event_handler.invoke({'Records': records}, None)
+
+    mock_process.assert_called_once()
+    assert mock_process.call_args.args[0].event_count == 3
+
+
+@patch(
+    'podaac.sigevent.event_handler.NOTIFICATION_EMAILS',
+    ['joshua.a.garde@jpl.nasa.gov'],
+)
+@patch('podaac.sigevent.event_handler.outbox.enqueue')
+@patch('podaac.sigevent.outbox.ses')
+def test_send_notification_throttled(mock_ses, mock_enqueue, event_message):
+    mock_ses.send_email.side_effect = ClientError(
+        {'Error': {'Code': 'TooManyRequestsException'}}, 'SendEmail'
+    )
+
+    event_handler.send_notification(event_message)
+
+    mock_enqueue.assert_called_once()
+    assert mock_enqueue.call_args.args[0] == 'joshua.a.garde@jpl.nasa.gov'
+
+
+@patch(
+    'podaac.sigevent.event_handler.NOTIFICATION_EMAILS',
+    ['joshua.a.garde@jpl.nasa.gov'],
+)
+@patch('podaac.sigevent.event_handler.outbox.enqueue')
+@patch('podaac.sigevent.outbox.ses')
+def test_send_notification_rejected(mock_ses, mock_enqueue, event_message):
+    mock_ses.send_email.side_effect = ClientError(
+        {'Error': {'Code': 'MessageRejected'}}, 'SendEmail'
+    )
+
+    with raises(ClientError):
+        event_handler.send_notification(event_message)
+
+    mock_enqueue.assert_not_called()
+
+
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_direct(mock_process, event_message):
+    messages = [
+        json.loads(event_message.model_dump_json(exclude={'timestamp'})),
+        json.loads(event_message.model_copy(update={
+            'event_level': EventLevel.ERROR
+        }).model_dump_json()),
+        {'collection_name': 'invalid-message'}
+    ]
+
+    summary = event_handler.invoke_direct(messages, None)
+
+    assert summary == {'accepted': 2, 'rejected': [2], 'failed': 0}
+    processed = [call.args[0] for call in mock_process.call_args_list]
+    assert len(processed) == 2
+    assert processed[0].event_level is EventLevel.ERROR
+    assert processed[1].timestamp is not None
+
+
+@patch(
+    'podaac.sigevent.event_handler.routing_table',
+    RoutingTable.compile([{
+        'collections': ['collection-*'],
+        'min_level': 'ERROR',
+        'recipients': ['podaac-ia@jpl.nasa.gov']
+    }])
+)
+@patch('podaac.sigevent.outbox.ses')
+def test_send_notification_routed(mock_ses, event_message):
+    event_handler.send_notification(event_message.model_copy(update={
+        'event_level': EventLevel.ERROR
+    }))
+    event_handler.send_notification(event_message.model_copy(update={
+        'collection_name': 'other-collection',
+        'event_level': EventLevel.ERROR
+    }))
+
+    mock_ses.send_email.assert_called_once()
+    assert mock_ses.send_email.call_args.kwargs['Destination'] == \
+        {'ToAddresses': ['podaac-ia@jpl.nasa.gov']}
+
+
+@patch(
+    'podaac.sigevent.event_handler.NOTIFICATION_EMAILS',
+    ['joshua.a.garde@jpl.nasa.gov', 'podaac-ia@jpl.nasa.gov'],
+)
+@patch('podaac.sigevent.event_handler.render_notification')
+@patch('podaac.sigevent.outbox.ses')
+def test_send_notification_renders_once(mock_ses, mock_render, event_message):
+    mock_render.return_value = RenderedNotification('subject', 'body')
+
+    event_handler.send_notification(event_message)
+
+    mock_render.assert_called_once_with(event_message)
+    assert mock_ses.send_email.call_count == 2
+
+
+@patch('podaac.sigevent.event_handler.cloudwatchlogs')
+@patch('podaac.sigevent.event_handler.send_notification')
+@patch('podaac.sigevent.granule_index.granule_table')
+def test_process_event_message_index_failure(mock_table, mock_send, mock_cloudwatch, event_message):
+    mock_table.batch_writer.return_value.__exit__.side_effect = ClientError(
+        {'Error': {'Code': 'ProvisionedThroughputExceededException'}},
+        'BatchWriteItem'
+    )
+    event_message = event_message.model_copy(update={
+        'granule_name': 'granule-name',
+        'event_level': EventLevel.ERROR
+    })
+
+    event_handler.process_event_message(event_message)
+
+    mock_table.batch_writer.assert_called_once()
+    mock_send.assert_called_with(event_message)
+
+
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_partial_batch_failure(mock_process, event_message):
+    def process(message, **_):
+        if message.subject == 'fail':
+            raise ClientError({'Error': {'Code': 'Throttling'}}, 'PutLogEvents')
+
+    mock_process.side_effect = process
+    records = [
+        sqs_record(event_message, 'id-1'),
+        sqs_record(event_message.model_copy(update={'subject': 'fail'}), 'id-2'),
+        sqs_record(event_message, 'id-3')
+    ]
+
+    result = event_handler.invoke({'Records': records}, None)
+
+    assert mock_process.call_count == 3
+    assert result == {'batchItemFailures': [{'itemIdentifier': 'id-2'}]}
+
+
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_malformed_record(mock_process, event_message):
+    records = [
+        sqs_record(event_message, 'id-1'),
+        {'messageId': 'id-2', 'body': 'not json'},
+        {'messageId': 'id-3', 'body': json.dumps({'Message': '{}'})},
+        sqs_record(event_message, 'id-4')
+    ]
+
+    result = event_handler.invoke({'Records': records}, None)
+
+    assert mock_process.call_count == 2
+    assert result == {'batchItemFailures': [
+        {'itemIdentifier': 'id-2'}, {'itemIdentifier': 'id-3'}
+    ]}
+
+
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_kinesis_malformed_record(mock_process, event_message):
+    def kinesis_record(data: bytes, sequence_number: str):
+        return {'kinesis': {
+            'data': base64.b64encode(data).decode(),
+            'approximateArrivalTimestamp': 0.0,
+            'sequenceNumber': sequence_number
+        }}
+
+    records = [
+        kinesis_record(event_message.model_dump_json().encode(), '1'),
+        kinesis_record(b'[{"subject": ', '2'),
+        kinesis_record(event_message.model_dump_json().encode(), '3')
+    ]
+
+    result = event_handler.invoke_kinesis({'Records': records}, None)
+
+    assert mock_process.call_count == 2
+    assert result == {'batchItemFailures': [{'itemIdentifier': '2'}]}
+
+
+@patch('podaac.sigevent.event_handler.ROLLUP_MODE', True)
+@patch('podaac.sigevent.event_handler.process_event_message')
+def test_invoke_partial_batch_failure_rollup(mock_process, event_message):
+    mock_process.side_effect = ClientError(
+        {'Error': {'Code': 'Throttling'}}, 'PutLogEvents'
+    )
+    records = [sqs_record(event_message, f'id-{index}') for index in range(3)]
+
+    result = event_handler.invoke({'Records': records}, None)
+
+    mock_process.assert_called_once()
+    assert result == {'batchItemFailures': [
+        {'itemIdentifier': f'id-{index}'} for index in range(3)
+    ]}
+
+
+@patch('podaac.sigevent.event_handler.ROLLUP_MODE', True)
+@patch('podaac.sigevent.event_handler.ROLLUP_SAMPLE_SIZE', 2)
+@patch('podaac.sigevent.event_handler.cloudwatchlogs')
+@patch('podaac.sigevent.granule_index.granule_table')
+def test_invoke_rollup_indexes_all_granules(mock_table, mock_cloudwatch, event_message):
+    records = [
+        sqs_record(event_message.model_copy(update={
+            'granule_name': f'granule-{index}'
+        }))
+        for index in range(4)
+    ]
+
+    event_handler.invoke({'Records': records}, None)
+
+    mock_cloudwatch.put_log_events.assert_called_once()
+    mock_table.batch_writer.assert_called_once()
+    batch = mock_table.batch_writer.return_value.__enter__.return_value
+    indexed = [
+        call.kwargs['Item']['granule_name']
+        for call in batch.put_item.call_args_list
+    ]
+    assert indexed == [f'granule-{index}' for index in range(4)]
@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+from os import environ
+from unittest.mock import MagicMock, patch
+
+from pytest import fixture, raises
+
+from podaac.sigevent.message import EventLevel, EventMessage
+
+with (
+    patch('boto3.client'),
+    patch('boto3.resource'),
+    patch.dict(
+        environ,
+        {'SIGEVENT_ENV': 'test'},
+    ),
+):
+    from podaac.sigevent import granule_index
+
+
+@fixture
+def event_message():
+    return EventMessage(
+        collection_name='collection-name',
+        category='category',
+        subject='subject',
+        description='description',
+        granule_name='granule-name',
+        source_name='source-name',
+        executor='executor',
+        event_level=EventLevel.ERROR,
+        timestamp=datetime(1970, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+@fixture
+def mock_table():
+    table = MagicMock()
+    with patch('podaac.sigevent.granule_index.granule_table', table):
+        yield table
+
+
+def written_items(mock_table):
+    batch = mock_table.batch_writer.return_value.__enter__.return_value
+    return [call.kwargs['Item'] for call in batch.put_item.call_args_list]
+
+
+@patch('podaac.sigevent.granule_index.CLOUDWATCH_LOG_GROUP', 'test-cw-group')
+def test_index_event(mock_table, event_message):
+    granule_index.index_event(event_message, 'collection-name')
+
+    [item] = written_items(mock_table)
+    assert item['granule_name'] == 'granule-name'
+    assert item['event_key'].startswith('0000000000000#')
+    assert item['timestamp'] == 0
+    assert item['event_level'] == 'ERROR'
+    assert item['log_group'] == 'test-cw-group'
+    assert item['log_stream'] == 'collection-name'
+
+
+def test_index_event_without_granule(mock_table, event_message):
+    granule_index.index_event(
+        event_message.model_copy(update={'granule_name': None}),
+        'collection-name'
+    )
+
+    mock_table.batch_writer.assert_not_called()
+
+
+def test_index_event_granule_names(mock_table, event_message):
+    granule_index.index_event(
+        event_message, 'collection-name',
+        (f'granule-{index}' for index in range(30))
+    )
+
+    mock_table.batch_writer.assert_called_once()
+    items = written_items(mock_table)
+    assert [item['granule_name'] for item in items] == \
+        [f'granule-{index}' for index in range(30)]
+    assert len({item['event_key'] for item in items}) == 1
+
+
+@patch('podaac.sigevent.granule_index.granule_table', None)
+def test_index_event_disabled(event_message):
+    granule_index.index_event(event_message, 'collection-name')
+
+
+@patch('podaac.sigevent.granule_index.granule_table', None)
+def test_lookup_granule_events_disabled():
+    with raises(RuntimeError):
+        granule_index.lookup_granule_events('granule-name')
+
+
+def test_lookup_granule_events_paginates(mock_table):
+    item = {
+        'granule_name': 'granule-name',
+        'event_key': '0000000000000#abc',
+        'timestamp': 0,
+        'event_level': 'ERROR',
+        'category': 'category',
+        'subject': 'subject',
+        'collection_name': 'collection-name',
+        'log_group': 'test-cw-group',
+        'log_stream': 'collection-name'
+    }
+    mock_table.query.side_effect = [
+        {'Items': [item], 'LastEvaluatedKey': {'event_key': 'a'}},
+        {'Items': [item]}
+    ]
+
+    records = granule_index.lookup_granule_events('granule-name')
+
+    assert len(records) == 2
+    assert records[0]['log_stream'] == 'collection-name'
+    assert mock_table.query.call_args_list[1].kwargs['ExclusiveStartKey'] == \
+        {'event_key': 'a'}
+
+
+def test_lookup_granule_events_limit(mock_table):
+    mock_table.query.return_value = {
+        'Items': [{
+            'timestamp': 0,
+            'event_level': 'ERROR',
+            'category': 'category',
+            'subject': 'subject',
+            'collection_name': 'collection-name',
+            'log_group': 'test-cw-group',
+            'log_stream': 'collection-name'
+        }],
+        'LastEvaluatedKey': {'event_key': 'a'}
+    }
+
+    records = granule_index.lookup_granule_events('granule-name', limit=1)
+
+    assert len(records) == 1
+    mock_table.query.assert_called_once()
+    assert mock_table.query.call_args.kwargs['Limit'] == 1
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from os import environ
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from pytest import fixture, raises
+
+with (
+    patch('boto3.client'),
+    patch('boto3.resource'),
+    patch.dict(environ, {'SIGEVENT_ENV': 'test'}),
+):
+    from podaac.sigevent import outbox
+
+
+@fixture
+def mock_table():
+    table = MagicMock()
+    with patch('podaac.sigevent.outbox.outbox_table', table):
+        yield table
+
+
+@fixture
+def mock_ses():
+    with patch('podaac.sigevent.outbox.ses') as ses:
+        yield ses
+
+
+@fixture
+def outbox_item():
+    return {
+        'notification_id': 'notification-id',
+        'address': 'podaac-ia@jpl.nasa.gov',
+        'subject': 'subject',
+        'body': 'body',
+        'attempts': 0,
+        'next_attempt': 0,
+        'expiration': 0
+    }
+
+
+def throttling_error():
+    return ClientError({'Error': {'Code': 'Throttling'}}, 'SendEmail')
+
+
+@patch('podaac.sigevent.outbox.datetime')
+def test_enqueue(mock_date, mock_table):
+    mock_date.now.return_value = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    outbox.enqueue('podaac-ia@jpl.nasa.gov', 'subject', 'body')
+
+    kwargs = mock_table.put_item.call_args.kwargs
+    assert kwargs['Item']['address'] == 'podaac-ia@jpl.nasa.gov'
+    assert kwargs['Item']['attempts'] == 0
+    assert kwargs['Item']['next_attempt'] == 60
+    assert kwargs['ConditionExpression'] == \
+        'attribute_not_exists(notification_id)'
+
+
+def test_enqueue_duplicate(mock_table):
+    mock_table.put_item.side_effect = ClientError(
+        {'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem'
+    )
+
+    outbox.enqueue('podaac-ia@jpl.nasa.gov', 'subject', 'body')
+
+
+def test_enqueue_failure(mock_table):
+    mock_table.put_item.side_effect = ClientError(
+        {'Error': {'Code': 'ResourceNotFoundException'}}, 'PutItem'
+    )
+
+    with raises(ClientError):
+        outbox.enqueue('podaac-ia@jpl.nasa.gov', 'subject', 'body')
+
+
+def test_drain_delivers(mock_table, mock_ses, outbox_item):
+    mock_table.scan.side_effect = [
+        {'Items': [outbox_item], 'LastEvaluatedKey': {'notification_id': 'a'}},
+        {'Items': []}
+    ]
+
+    outbox.drain()
+
+    mock_ses.send_email.assert_called_once()
+    assert mock_ses.send_email.call_args.kwargs['Destination'] == \
+        {'ToAddresses': ['podaac-ia@jpl.nasa.gov']}
+    mock_table.delete_item.assert_called_once_with(
+        Key={'notification_id': 'notification-id'}
+    )
+    assert mock_table.scan.call_count == 2
+
+
+def test_deliver_backoff(mock_table, mock_ses, outbox_item):
+    mock_ses.send_email.side_effect = throttling_error()
+    outbox_item['attempts'] = 2
+
+    outbox.deliver(outbox_item, 1000)
+
+    mock_table.delete_item.assert_not_called()
+    values = mock_table.update_item.call_args.kwargs['ExpressionAttributeValues']
+    assert values == {':attempts': 3, ':next_attempt': 1000 + 480}
+
+
+@patch('podaac.sigevent.outbox.OUTBOX_MAX_ATTEMPTS', 3)
+def test_deliver_exhausted(mock_table, mock_ses, outbox_item):
+    mock_ses.send_email.side_effect = throttling_error()
+    outbox_item['attempts'] = 2
+
+    outbox.deliver(outbox_item, 1000)
+
+    mock_table.update_item.assert_not_called()
+    mock_table.delete_item.assert_called_once()
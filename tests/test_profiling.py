@@ -0,0 +1,76 @@
+import json
+from os import environ
+from unittest.mock import MagicMock, patch
+
+from pytest import raises
+
+with patch.dict(environ, {'SIGEVENT_ENV': 'test'}):
+    from podaac.sigevent import profiling
+
+
+def handler(event, _):
+    return [bytearray(1024) for _ in range(event['count'])]
+
+
+@patch('podaac.sigevent.profiling.PROFILING_ENABLED', False)
+def test_profiled_disabled():
+    assert profiling.profiled(handler) is handler
+
+
+@patch('podaac.sigevent.profiling.PROFILING_ENABLED', True)
+def test_profiled_enabled():
+    wrapped = profiling.profiled(handler)
+
+    assert wrapped is not handler
+    assert wrapped.__wrapped__ is handler
+
+
+@patch('podaac.sigevent.profiling.logger')
+def test_profile_handler(mock_logger):
+    context = MagicMock(aws_request_id='request-id')
+
+    result = profiling.profile_handler(handler, top_n=3)({'count': 10}, context)
+
+    assert len(result) == 10
+    report = json.loads(mock_logger.info.call_args.args[1])
+    assert report['handler'] == f'{__name__}.handler'
+    assert report['request_id'] == 'request-id'
+    assert report['peak_memory'] >= 10 * 1024
+    assert len(report['hotspots']) == 3
+    assert len(report['allocations']) <= 3
+    assert any('handler' in hotspot['function'] for hotspot in report['hotspots'])
+
+
+@patch('podaac.sigevent.profiling.logger')
+def test_profile_handler_artifact(mock_logger, tmp_path):
+    profiling.profile_handler(handler, top_n=3, output_dir=str(tmp_path))(
+        {'count': 1}, None
+    )
+
+    artifacts = list(tmp_path.iterdir())
+    assert len(artifacts) == 1
+    assert json.loads(artifacts[0].read_text())['request_id'] is None
+
+
+@patch('podaac.sigevent.profiling.logger')
+def test_profile_handler_report_failure(mock_logger, tmp_path):
+    output_file = tmp_path / 'file'
+    output_file.write_text('')
+
+    result = profiling.profile_handler(handler, output_dir=str(output_file))(
+        {'count': 2}, None
+    )
+
+    assert len(result) == 2
+    mock_logger.exception.assert_called_once()
+
+
+@patch('podaac.sigevent.profiling.logger')
+def test_profile_handler_report_failure_keeps_error(mock_logger, tmp_path):
+    output_file = tmp_path / 'file'
+    output_file.write_text('')
+
+    with raises(KeyError):
+        profiling.profile_handler(handler, output_dir=str(output_file))({}, None)
+
+    mock_logger.exception.assert_called_once()
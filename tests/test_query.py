@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+import json
+from os import environ
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+from pytest import fixture
+
+from podaac.sigevent.message import EventLevel
+
+with (
+    patch('boto3.client'),
+    patch.dict(environ, {'SIGEVENT_ENV': 'test'}),
+):
+    from podaac.sigevent import query
+
+
+def log_event(subject):
+    return {
+        'message': json.dumps({
+            'collection_name': 'collection-name',
+            'category': 'category',
+            'subject': subject,
+            'description': 'description',
+            'event_level': EventLevel.ERROR,
+            'source_name': 'source-name',
+            'executor': 'executor'
+        })
+    }
+
+
+@fixture
+def event_query():
+    return query.EventQuery(
+        collection_name='collection-name',
+        start_time=datetime(1990, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(1990, 1, 2, tzinfo=timezone.utc),
+        levels=frozenset([EventLevel.ERROR, EventLevel.WARN])
+    )
+
+
+@fixture
+def mock_cloudwatch():
+    with patch('podaac.sigevent.query.cloudwatchlogs') as cloudwatch:
+        query.query_cache.clear()
+        yield cloudwatch
+
+
+def test_filter_pattern(event_query):
+    assert event_query.filter_pattern() == \
+        '{ ($.event_level = "ERROR") || ($.event_level = "WARN") }'
+    assert event_query.model_copy(update={'levels': None}) \
+        .filter_pattern() is None
+
+
+@patch('podaac.sigevent.query.CLOUDWATCH_LOG_GROUP', 'test-cw-group')
+def test_query_events_lazy(mock_cloudwatch, event_query):
+    mock_cloudwatch.filter_log_events.side_effect = [
+        {'events': [log_event('first')], 'nextToken': 'token'},
+        {'events': [log_event('second')]}
+    ]
+
+    iterator = iter(query.query_events(event_query))
+    mock_cloudwatch.filter_log_events.assert_not_called()
+
+    assert next(iterator).subject == 'first'
+    mock_cloudwatch.filter_log_events.assert_called_once_with(
+        logGroupName='test-cw-group',
+        logStreamNames=['collection-name'],
+        startTime=631152000000,
+        endTime=631238400000,
+        filterPattern='{ ($.event_level = "ERROR") || ($.event_level = "WARN") }'
+    )
+
+    assert next(iterator).subject == 'second'
+    assert mock_cloudwatch.filter_log_events.call_args.kwargs['nextToken'] == \
+        'token'
+
+
+def test_query_events_resume(mock_cloudwatch, event_query):
+    mock_cloudwatch.filter_log_events.side_effect = [
+        {'events': [log_event('first')], 'nextToken': 'token'},
+        {'events': [log_event('second')]}
+    ]
+
+    iterator = query.query_events(event_query, page_size=1)
+    next(iterator.pages())
+    assert iterator.cursor == 'token'
+
+    resumed = list(query.query_events(event_query, cursor=iterator.cursor))
+    assert [event.subject for event in resumed] == ['second']
+    assert mock_cloudwatch.filter_log_events.call_args.kwargs['nextToken'] == \
+        'token'
+
+
+def test_query_events_resume_partial_page(mock_cloudwatch, event_query):
+    mock_cloudwatch.filter_log_events.side_effect = [
+        {'events': [log_event('first'), log_event('second')], 'nextToken': 'token'},
+        {'events': [log_event('first'), log_event('second')], 'nextToken': 'token'},
+        {'events': [log_event('third')]}
+    ]
+
+    iterator = query.query_events(event_query)
+    events = iter(iterator)
+    next(events)
+    assert iterator.cursor is None
+
+    resumed = list(query.query_events(event_query, cursor=iterator.cursor))
+    assert [event.subject for event in resumed] == ['first', 'second', 'third']
+
+
+def test_query_events_missing_stream(mock_cloudwatch, event_query):
+    mock_cloudwatch.filter_log_events.side_effect = ClientError(
+        {'Error': {'Code': 'ResourceNotFoundException'}}, 'FilterLogEvents'
+    )
+
+    assert not list(query.query_events(event_query))
+
+
+def test_fetch_events_cached(mock_cloudwatch, event_query):
+    mock_cloudwatch.filter_log_events.return_value = {
+        'events': [log_event('first')]
+    }
+
+    first = query.fetch_events(event_query)
+    second = query.fetch_events(event_query)
+
+    assert first == second
+    mock_cloudwatch.filter_log_events.assert_called_once()
+
+
+def test_query_cache_eviction():
+    cache = query.QueryCache(max_size=2, ttl=60)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+@patch('podaac.sigevent.query.time')
+def test_query_cache_expiration(mock_time):
+    mock_time.monotonic.return_value = 0
+    cache = query.QueryCache(max_size=2, ttl=60)
+    cache.put('a', 1)
+
+    mock_time.monotonic.return_value = 61
+    assert cache.get('a') is None
@@ -0,0 +1,68 @@
+from datetime import date
+import html
+import subprocess
+import sys
+from unittest.mock import patch
+
+import jinja2
+
+from podaac.sigevent import rendering
+from podaac.sigevent.message import EventLevel, EventMessage
+
+
+def test_render_notification():
+    message = EventMessage(
+        collection_name='collection-name',
+        category='category',
+        subject='<subject>',
+        description='description',
+        source_name='source-name',
+        executor='executor',
+        event_level=EventLevel.ERROR
+    )
+
+    notification = rendering.render_notification(message, date(1970, 1, 1))
+
+    assert notification.subject == '[category] 1970-01-01 collection-name'
+    assert html.escape(message.model_dump_json()) in notification.body
+    assert '<subject>' not in notification.body
+
+
+def test_create_jinja_env_bytecode_cache(tmp_path):
+    with (
+        patch('podaac.sigevent.rendering.COMPILED_TEMPLATES_DIR', str(tmp_path / 'missing')),
+        patch('podaac.sigevent.rendering.BYTECODE_CACHE_DIR', str(tmp_path / 'cache'))
+    ):
+        env = rendering.create_jinja_env()
+        env.get_template('summary.html')
+
+    assert isinstance(env.bytecode_cache, jinja2.FileSystemBytecodeCache)
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+
+def test_create_jinja_env_precompiled(tmp_path):
+    rendering.precompile_templates(str(tmp_path))
+
+    with patch('podaac.sigevent.rendering.COMPILED_TEMPLATES_DIR', str(tmp_path)):
+        env = rendering.create_jinja_env()
+
+    assert len(list(tmp_path.iterdir())) == len(rendering.REPORT_TEMPLATES)
+    compiled = env.get_template('summary.html')
+    assert 'PO.DAAC Sigevent Daily Summary' in compiled.render(
+        analyses=[], source_reports=[]
+    )
+
+
+def test_precompile_without_pydantic(tmp_path):
+    # build.sh precompiles after swapping in Linux pydantic wheels, which do
+    # not import on macOS builders
+    script = (
+        'import runpy, sys\n'
+        'sys.modules["pydantic"] = None\n'
+        f'sys.argv = ["rendering", {str(tmp_path)!r}]\n'
+        'runpy.run_module("podaac.sigevent.rendering", run_name="__main__")\n'
+    )
+
+    subprocess.run([sys.executable, '-c', script], check=True)
+
+    assert len(list(tmp_path.iterdir())) == len(rendering.REPORT_TEMPLATES)
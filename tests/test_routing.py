@@ -0,0 +1,75 @@
+from pydantic import ValidationError
+from pytest import fixture, raises
+
+from podaac.sigevent.message import EventLevel, EventMessage
+from podaac.sigevent.routing import RoutingTable
+
+
+@fixture
+def routing_table():
+    return RoutingTable.compile([{
+        'collections': ['MODIS_*'],
+        'min_level': 'WARN',
+        'recipients': ['modis@jpl.nasa.gov']
+    }, {
+        'collections': ['MODIS_A-*-v2019.0'],
+        'categories': ['ingest'],
+        'min_level': 'ERROR',
+        'recipients': ['ingest@jpl.nasa.gov']
+    }, {
+        'collections': ['VIIRS_?PP'],
+        'recipients': ['viirs@jpl.nasa.gov']
+    }, {
+        'min_level': 'ERROR',
+        'recipients': ['ops@jpl.nasa.gov']
+    }])
+
+
+def message(collection_name, category='ingest', level=EventLevel.ERROR):
+    return EventMessage(
+        collection_name=collection_name,
+        category=category,
+        subject='subject',
+        description='description',
+        source_name='source-name',
+        executor='executor',
+        event_level=level
+    )
+
+
+def test_resolve_prefix(routing_table):
+    assert routing_table.resolve(message('MODIS_T-JPL', level=EventLevel.WARN)) == \
+        {'modis@jpl.nasa.gov'}
+    assert routing_table.resolve(message('MODIS_T-JPL', level=EventLevel.INFO)) == \
+        frozenset()
+
+
+def test_resolve_infix_wildcard_and_category(routing_table):
+    assert routing_table.resolve(message('MODIS_A-JPL-L2P-v2019.0')) == {
+        'modis@jpl.nasa.gov', 'ingest@jpl.nasa.gov', 'ops@jpl.nasa.gov'
+    }
+    assert routing_table.resolve(
+        message('MODIS_A-JPL-L2P-v2019.0', category='archive')
+    ) == {'modis@jpl.nasa.gov', 'ops@jpl.nasa.gov'}
+    assert routing_table.resolve(
+        message('MODIS_A-JPL-L2P-v2014.0', level=EventLevel.WARN)
+    ) == {'modis@jpl.nasa.gov'}
+
+
+def test_resolve_single_character_wildcard(routing_table):
+    assert routing_table.resolve(
+        message('VIIRS_NPP', level=EventLevel.DEBUG)
+    ) == {'viirs@jpl.nasa.gov'}
+    assert routing_table.resolve(
+        message('VIIRS_NPPX', level=EventLevel.DEBUG)
+    ) == frozenset()
+
+
+def test_resolve_catch_all(routing_table):
+    assert routing_table.resolve(message('OTHER')) == {'ops@jpl.nasa.gov'}
+    assert routing_table.resolve(message('')) == {'ops@jpl.nasa.gov'}
+
+
+def test_compile_invalid():
+    with raises(ValidationError):
+        RoutingTable.compile([{'collections': ['*'], 'min_level': 'FATAL'}])